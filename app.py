@@ -3,33 +3,49 @@
 # ────────────────────────────────────────────────
 from flask import (
     Flask, render_template, request, redirect,
-    url_for, session, jsonify, make_response, send_file
+    url_for, session, jsonify, make_response, send_file, Response
 )
-# for PDF generation, copilot helped me understand how to use WeasyPrint
-# and Jinja2 for rendering HTML templates to PDF.
-from weasyprint import HTML
-from jinja2 import Environment, FileSystemLoader
-
-import pandas as pd
+import click
 import json
-import os
-import tempfile
-import sys
 import io
+from datetime import datetime
 
 # ────────────────────────────────────────────────
 # 🛠️ Internal Modules
 # ────────────────────────────────────────────────
-from config import EMPLOYEE_CSV, EVENT_FOLDER, CSV_ENCODING
+from config import EMPLOYEE_CSV, REPORT_STREAM_CHUNK, STORAGE_BACKEND, PRELOAD_HEAVY_MODULES
 from utils import (
-    read_employees, save_event_rows,
-    get_employer_info, encode_event_id
+    save_event_rows,
+    get_employer_info
 )
-
-# ────────────────────────────────────────────────
-# 🧠 Jinja2 Setup (for multipage PDF rendering)
-# ────────────────────────────────────────────────
-env = Environment(loader=FileSystemLoader("templates"))
+from storage import (
+    employee_store, load_month, list_months, list_events, event_rows, month_summary, data_version,
+    query_events
+)
+from event_store import normalise_month, is_archived, archive_path, list_months as list_csv_months
+from report_query import summarise
+import sqlite_store
+import event_archive
+import employee_import
+from pdf_forms import (
+    PACK_SOURCES, render_employee_pack, render_packs, event_from_row,
+    pack_filename, stream_zip, bundle_pdf
+)
+from report_pdf import (
+    REPORT_SORTS, REPORT_EXPORTS, load_month_file, load_export_rows,
+    export_download_name, export_total, report_key, render_report
+)
+import pdf_cache
+import pdf_jobs
+import instrumentation
+import http_cache
+import template_env
+import lazy_imports
+
+# pandas is imported on first use, see lazy_imports.py
+pd = lazy_imports.lazy_import("pandas")
+from instrumentation import span
+from http_cache import conditional
 
 # ────────────────────────────────────────────────
 # ⚙️ Flask App Configuration
@@ -40,19 +56,49 @@ app = Flask(__name__, template_folder="templates")
 # This is essential for securely signing the session cookie.
 app.secret_key = "123456789"  # Replace with secure key in production
 
+# 💤 WeasyPrint, pandas, pyarrow and PyPDF2 load on first use, unless preloading is switched on
+if PRELOAD_HEAVY_MODULES:
+    lazy_imports.preload()
+
+# Flask's own templates (the pages) share the compiled template cache with the PDF templates
+app.jinja_options = {**app.jinja_options, "bytecode_cache": template_env.BYTECODE_CACHE}
+
+# ⏱️ Request timings: Server-Timing headers, /metrics and (opt-in) slow request profiles
+instrumentation.init_app(app)
+
+# 🗜️ gzip/brotli compression of text and JSON responses (see http_cache.py)
+http_cache.init_app(app)
+
+# 🔥 Template warm-up
+# Every PDF template (and the pack stylesheet) is loaded when the app starts, so the first
+# export after a deploy doesn't have to compile them. The report templates are also Flask pages, so they are
+# loaded into Flask's environment as well.
+REPORT_TEMPLATES = [export["template"] for export in REPORT_EXPORTS.values()]
+template_env.warm_up(PACK_SOURCES + REPORT_TEMPLATES)
+for name in REPORT_TEMPLATES:
+    app.jinja_env.get_template(name)
+
 # ────────────────────────────────────────────────
-# 📥 Utility: Load Employee CSV
+# 📤 Utility: Send a Cached PDF
 # ────────────────────────────────────────────────
-# I decided to create utility functions to load the CSV's and data,
-# so I can reuse it across different routes without duplicating code.
-def load_employees():
-    try:
-        return pd.read_csv(EMPLOYEE_CSV, dtype={"Contact": str})
-    except FileNotFoundError:
-        return pd.DataFrame(columns=["ID Number", "Surname", "Name", "Contact"])
-
-def load_data():
-    return pd.read_csv(EMPLOYEE_CSV, encoding=CSV_ENCODING)
+# Rendered PDFs are looked up in the disk cache by their content hash.
+# The same hash is used as the ETag, so a browser that already has the file
+# gets a 304 without us even reading it from disk.
+def send_cached_pdf(key, render, download_name, as_attachment=True):
+    if key in request.if_none_match:
+        response = make_response("", 304)
+        response.set_etag(key)
+        return response
+
+    pdf = pdf_cache.get_or_render(key, render)
+    response = send_file(
+        io.BytesIO(pdf),
+        mimetype="application/pdf",
+        download_name=download_name,
+        as_attachment=as_attachment
+    )
+    response.set_etag(key)
+    return response
 
 # ───────────────────────────────────────────────
 # 👥 Employee Management
@@ -68,6 +114,23 @@ def home():
 def employees():
     return render_template("employees.html")
 
+# 🔎 Employee Search (for the typeahead dropdowns)
+# e.g. /search-employees?q=mol&offset=0&limit=20
+# Matches employees whose surname, name or ID number start with each word typed, by surname.
+@app.route("/search-employees")
+def search_employees():
+    query = request.args.get("q", "")
+    offset = max(request.args.get("offset", 0, type=int), 0)
+    limit = min(max(request.args.get("limit", 20, type=int), 1), 100)
+
+    total, matches = employee_store.search(query, offset, limit)
+    return jsonify(
+        employees=[{"id": e["ID Number"], "surname": e["Surname"], "name": e["Name"]} for e in matches],
+        total=total,
+        offset=offset,
+        limit=limit
+    )
+
 # ➕ Add a New Employee
 # I struggled with posting data and after some trial and error,
 # Copilot suggested to strip the input values to avoid leading/trailing spaces.
@@ -79,25 +142,22 @@ def add_employee():
         surname = request.form.get("surname", "").strip()
         name = request.form.get("name", "").strip()
         contact = request.form.get("contact", "").strip()
-        df = load_data()
 
         # ✋ Validation checks
-        if id_number in df["ID Number"].astype(str).values:
+        if id_number in employee_store:
             error = "An employee with this ID number already exists."
         elif not id_number.isdigit() or len(id_number) != 13:
             error = "ID number must be a 13-digit number."
         elif not contact.isdigit() or len(contact) < 10:
             error = "Contact must be at least 10 digits."
         else:
-            # ✅ Add new entry to DataFrame
-            new_entry = pd.DataFrame([{
+            # ✅ Add new entry to the employee store
+            employee_store.add({
                 "ID Number": id_number,
                 "Surname": surname,
                 "Name": name,
                 "Contact": contact
-            }])
-            df = pd.concat([df, new_entry], ignore_index=True)
-            df.to_csv(EMPLOYEE_CSV, index=False)
+            })
             session["success"] = "Employee added successfully!"
             return redirect(url_for("add_employee"))
 
@@ -111,19 +171,14 @@ def add_employee():
 # and pre-fill the form fields, so the user can edit existing records.
 @app.route("/edit_employee")
 def edit_employee():
-    df = load_data()
-    all_employees = df.sort_values("Surname").to_dict(orient="records")
     selected = None
 
     # 🎯 Load selected employee by ID
     if id_number := request.args.get("id_number"):
-        match = df[df["ID Number"].astype(str) == str(id_number)].to_dict("records")
-        if match:
-            selected = match[0]
+        selected = employee_store.get(id_number)
 
     return render_template(
         "employees/edit_employee.html",
-        all_employees=all_employees,
         selected_employee=selected,
         success_message=session.pop("success", None)
     )
@@ -134,47 +189,72 @@ def edit_employee():
 # Copilot also explained what and how jasonify works, so I could return JSON responses.
 @app.route("/update_employee", methods=["POST"])
 def update_employee():
-    df = load_data()
     id_number = request.form.get("id_number")
 
-    if id_number not in df["ID Number"].astype(str).values:
+    if not id_number or id_number not in employee_store:
         return jsonify({"error": "Employee not found"}), 404
 
     # ✍️ Overwrite existing fields
-    df.loc[df["ID Number"].astype(str) == id_number, ["Surname", "Name", "Contact"]] = [
-        request.form.get("surname"),
-        request.form.get("name"),
-        request.form.get("contact")
-    ]
-    df.to_csv(EMPLOYEE_CSV, index=False)
+    employee_store.update(id_number, {
+        "Surname": request.form.get("surname"),
+        "Name": request.form.get("name"),
+        "Contact": request.form.get("contact")
+    })
     session["success"] = "Update successful!"
     return redirect(url_for("edit_employee", id_number=id_number))
 
 # ❌ Remove Employee from Dataset
 @app.route("/remove_employee", methods=["GET", "POST"])
 def remove_employee():
-    df = load_data()
-
     if request.method == "POST":
         id_number = request.form.get("id_number")
-        if not id_number or id_number not in df["ID Number"].astype(str).values:
+        if not id_number or id_number not in employee_store:
             session["error"] = "Employee not found!"
             return redirect(url_for("remove_employee"))
 
         # 🧹 Remove employee row
-        df = df[df["ID Number"].astype(str) != str(id_number)]
-        df.to_csv(EMPLOYEE_CSV, index=False)
+        employee_store.remove(id_number)
         # The success message flashes too quickly, so I store it in the session.
         session["success"] = "Employee removed successfully!"
         return redirect(url_for("remove_employee"))
 
     return render_template(
         "employees/remove_employee.html",
-        all_employees=df.sort_values("Surname").to_dict(orient="records"),
         error=session.pop("error", None),
         success=session.pop("success", None)
     )
 
+# 📥 Import Employees from a CSV File
+# Columns: ID Number, Surname, Name, Contact. Every row is checked with the add form's rules,
+# plus a check for IDs repeated in the file, and the rows that pass are saved in one write
+# (see employee_import.py).
+# Form fields: file, mode=upsert|insert, dry_run=1 to only check the file.
+# Answers with JSON instead of the page when the request asks for application/json.
+@app.route("/import_employees", methods=["GET", "POST"])
+def import_employees():
+    if request.method == "GET":
+        return render_template("employees/import_employees.html")
+
+    wants_json = request.accept_mimetypes.best == "application/json"
+    upload = request.files.get("file")
+    mode = request.form.get("mode", "upsert")
+    report, error = None, None
+
+    if upload is None or not upload.filename:
+        error = "Choose a CSV file to import."
+    elif mode not in employee_import.IMPORT_MODES:
+        error = f"Unknown import mode: {mode}"
+    else:
+        try:
+            report = employee_import.import_employees(
+                upload.stream, employee_store, mode=mode, dry_run=request.form.get("dry_run") == "1")
+        except ValueError as e:
+            error = str(e)
+
+    if wants_json:
+        return (jsonify(report), 200) if error is None else (jsonify({"error": error}), 400)
+    return render_template("employees/import_employees.html", report=report, error=error, mode=mode)
+
 # ────────────────────────────────────────────────
 # 📅 Event Management
 # ────────────────────────────────────────────────
@@ -186,8 +266,6 @@ def remove_employee():
 # and enabled me to allow other dropdown lists to be populated dynamically based on the selected event.
 @app.route("/events", methods=["GET", "POST"])
 def events():
-    all_employees = sorted(read_employees(), key=lambda e: e["Surname"])
-
     if request.method == "POST":
         event_name = request.form.get("eventName", "").strip()
         event_date = request.form.get("eventDate", "").strip()
@@ -216,6 +294,14 @@ def events():
             session["error"] = "Complete all fields and assign at least one employee."
             return redirect(url_for("events"))
 
+        # 👥 Look up the assigned employees
+        # Each ID is a single lookup in the employee store's index, so saving stays fast
+        # however large the roster is. IDs that are not on the roster are reported, not dropped.
+        assigned, unknown_ids = employee_store.get_many(assigned_ids)
+        if not assigned:
+            session["error"] = "None of the selected employees were found: " + ", ".join(unknown_ids)
+            return redirect(url_for("events"))
+
         # 🧷 Build rows to save
         # I had some issues with the CSV writer not handling floats correctly,
         # so we format the amount as a string with 2 decimal places, Copilot assisted with this.
@@ -230,16 +316,16 @@ def events():
                 "Surname": emp["Surname"],
                 "Contact": emp["Contact"]
             }
-            for emp_id in assigned_ids
-            for emp in all_employees
-            if str(emp["ID Number"]).strip() == str(emp_id).strip()
+            for emp in assigned
         ]
 
         save_event_rows(rows, event_date)
         session["success"] = "Event saved successfully!"
+        if unknown_ids:
+            session["error"] = "These employees were not found and were left out: " + ", ".join(unknown_ids)
         return redirect(url_for("events"))
 
-    return render_template("events.html", all_employees=all_employees)
+    return render_template("events.html")
 
 # ────────────────────────────────────────────────
 # 📊 Forms & Document Generation
@@ -248,12 +334,7 @@ def events():
 # 📄 forms Dashboard
 @app.route("/forms")
 def forms():
-    try:
-        df = pd.read_csv(EMPLOYEE_CSV, dtype={"Contact": str})
-    except FileNotFoundError:
-        df = pd.DataFrame(columns=["ID Number", "Surname", "Name", "Contact"])
-    employees = df.sort_values("Surname").to_dict(orient="records")
-    return render_template("forms.html", all_employees=employees)
+    return render_template("forms.html")
 
 
 # 🧾 Generate Individual Employee PDF for an Event
@@ -261,116 +342,102 @@ def forms():
 def generate_employee_pdf(employee_id, event_date):
     
     # Fetch employee data
-    employee = next(
-        (e for e in read_employees() if str(e["ID Number"]) == employee_id),
-        None
-    )
+    employee = employee_store.get(employee_id)
     if not employee:
         return "Employee not found", 404
 
     # Determine CSV file based on event date
     # This was a bit tricky, as we need to extract the month from the date and build the file path,
-    # so we use string slicing to get the year and month, and then construct the path.
-    # Copilot helped with the string formatting, and os.path.join for the file path.
+    # so we use string slicing to get the year and month.
     month_key = f"{event_date[:4]}{event_date[5:7]}"
-    csv_path = os.path.join(EVENT_FOLDER, f"{month_key}.csv")
-    if not os.path.exists(csv_path):
+    df = load_month(month_key) if month_key.isdigit() else None
+    if df is None:
         return "No event data for this date", 404
 
-    df = pd.read_csv(csv_path, dtype=str)
-
-    # Apply map was suggested by Copilot to strip whitespace from all string fields,
-    # which is essential for matching employee IDs and event dates.
-    # This ensures that we don't have leading/trailing spaces causing mismatches.
-    # The lambda function checks if the value is a string before stripping it.
-    # This was a great learning moment, as I didn't know about `applymap` before.
-    # It allows us to apply a function to each element in the DataFrame.
-    df = df.applymap(lambda x: x.strip() if isinstance(x, str) else x)
-
     # Match event row
+    # Event files are stripped when they are saved (see safe_write.normalise_record),
+    # so matching is a vectorised comparison on two columns of the month frame.
     event_row = df[
         (df["Employee ID"] == employee_id.strip()) &
-        (df["Date"] == event_date.strip())
+        (df["Date"] == pd.to_datetime(event_date.strip(), errors="coerce"))
     ]
     if event_row.empty:
         return "No event match for employee on that date", 404
+    event_row = event_row.assign(Date=event_row["Date"].dt.strftime("%Y-%m-%d"))
 
     # iloc[0] is used to get the first row of the DataFrame,
     # as we expect only one match for a given employee and date.
-    row = event_row.iloc[0]
-    event = {
-        "Name": row["Event Name"],
-        "Date": row["Date"],
-        "AmountPayable": f"{float(row['Amount Payable']):.2f}"
-    }
+    event = event_from_row(event_row.iloc[0])
 
     # Get employer info to inject into all templates
+    # The three forms are rendered into a single PDF by pdf_forms.render_employee_pack.
     employer = get_employer_info()
+    key = pdf_cache.make_key([employee, event], PACK_SOURCES, employer)
 
-    # List of form templates to render
-    # This was a fun part, as I wanted to render multiple templates into a single PDF,
-    # so Copilot suggested using Jinja2's Environment to load and render multiple templates.
-    # I also learned how to use WeasyPrint to convert HTML to PDF.
-    templates = [
-        "forms/employment_agreement.html",
-        "forms/wage_claim.html",
-        "forms/payment_acknowledgment.html"
-    ]
+    # Generate response with embedded filename
+    return send_cached_pdf(
+        key,
+        lambda: render_employee_pack(employee, event, employer),
+        pack_filename(employee, event),
+        as_attachment=False
+    )
 
-    # Render first template
-    doc = HTML(string=env.get_template(templates[0]).render(
-        employee=employee, event=event, employer=employer)).render()
+# 🗂️ Generate Form Packs for Every Employee in an Event
+# Renders the packs on the shared render pool and returns them as one ZIP (default)
+# or as one merged PDF when ?format=pdf is passed.
+@app.route("/generate-event-pdfs/<month>/<event_id>")
+def generate_event_pdfs(month, event_id):
+    matches = event_rows(month, event_id) if month.isdigit() else None
+    if matches is None:
+        return "No event data for this month", 404
+    if matches.empty:
+        return "No employees assigned to this event", 404
+    matches = matches.assign(Date=matches["Date"].dt.strftime("%Y-%m-%d"))
+
+    # Employees that have since been removed still get their forms from the event row
+    employer = get_employer_info()
+    jobs = []
+    for row in matches.to_dict(orient="records"):
+        employee = employee_store.get(row["Employee ID"]) or {
+            "ID Number": row["Employee ID"],
+            "Surname": row["Surname"],
+            "Name": row["Name"],
+            "Contact": row["Contact"]
+        }
+        jobs.append((employee, event_from_row(row), employer))
+
+    packs = render_packs(jobs)
+    basename = event_id.replace("-", "")
+
+    if request.args.get("format") == "pdf":
+        return send_file(
+            bundle_pdf(packs),
+            mimetype="application/pdf",
+            download_name=f"{basename}.pdf",
+            as_attachment=True
+        )
 
-    # Append the rest
-    for tpl in templates[1:]:
-        sub = HTML(string=env.get_template(tpl).render(
-            employee=employee, event=event, employer=employer)).render()
-        doc.pages.extend(sub.pages)
+    # The ZIP is streamed, each entry goes out as soon as its pack is rendered.
+    return Response(
+        stream_zip(packs),
+        mimetype="application/zip",
+        headers={"Content-Disposition": f"attachment; filename={basename}.zip"}
+    )
 
-    # Generate response with embedded filename
-    filename = f"{employee['Surname']}_{employee['Name']}_{event['Date'].replace('-', '')}.pdf"
-    response = make_response(doc.write_pdf())
-    response.headers["Content-Type"] = "application/pdf"
-    response.headers["Content-Disposition"] = f"inline; filename={filename}"
-    return response
-    
 # 📅 Available Event Months
 @app.route("/get-months")
+@conditional(lambda: data_version())
 def get_months():
-    try:
-        files = os.listdir(EVENT_FOLDER)
-        months = sorted([
-            f.removesuffix(".csv")
-            for f in files if f.endswith(".csv") and f.removesuffix(".csv").isdigit()
-        ], reverse=True)
-        return jsonify(months=months)
-    except Exception as e:
-        print("Error listing event files:", e)
-        return jsonify(months=[])
+    return jsonify(months=sorted(list_months(), reverse=True))
 
 
 # 📆 Events Within a Month
 @app.route("/get-events/<month>")
+@conditional(lambda month: data_version(month))
 def get_events(month):
     try:
-        df = pd.read_csv(os.path.join(EVENT_FOLDER, f"{month}.csv"), dtype=str)
-
-        # Group by Event Name + Date and sort by Date DESC
-        grouped = (
-            df.groupby(["Event Name", "Date"])
-              .size()
-              .reset_index()
-              .sort_values(by="Date", ascending=False)
-        )
-
-        return jsonify(events=[
-            {
-                "name": row["Event Name"],
-                "date": row["Date"],
-                "id": encode_event_id(row["Date"], row["Event Name"])
-            }
-            for _, row in grouped.iterrows()
-        ])
+        # The per-month event index already holds every event, so no grouping is needed here
+        return jsonify(events=list_events(month))
     except Exception as e:
         print(f"Error loading events for {month}:", e)
         return jsonify(events=[])
@@ -378,16 +445,13 @@ def get_events(month):
 
 # 👥 Employees Assigned to Selected Event
 @app.route("/get-employees-in-event/<month>/<event_id>")
+@conditional(lambda month, event_id: data_version(month))
 def get_employees_in_event(month, event_id):
     try:
-        event_date, raw_name = event_id.split("_", 1)
-        event_name = raw_name.replace("_", " ")
-        path = os.path.join(EVENT_FOLDER, f"{month}.csv")
-
-        df = pd.read_csv(path, dtype=str)
-        df = df.applymap(lambda x: x.strip() if isinstance(x, str) else x)
-
-        matches = df[(df["Event Name"] == event_name) & (df["Date"] == event_date)]
+        # The event index maps the event_id straight to its rows in the month
+        matches = event_rows(month, event_id)
+        if matches is None:
+            return jsonify(employees=[])
 
         employees = [
             {
@@ -411,6 +475,19 @@ def get_employees_in_event(month, event_id):
 # 📅 Reports 
 # ────────────────────────────────────────────────
 
+# 🖨️ Render a report to PDF (served from the PDF cache when nothing changed)
+def send_report_pdf(df, template, download_name, period=None, total=None):
+    key = report_key(df, template, period)
+    return send_cached_pdf(key, lambda: render_report(df, template, period, total), download_name)
+
+# 📄 Export one of the monthly reports (see REPORT_EXPORTS) straight from the request
+def export_report_pdf(kind, filename):
+    df = load_export_rows(kind, filename)
+    if df is None:
+        return "File not found", 404
+    return send_report_pdf(df, REPORT_EXPORTS[kind]["template"], export_download_name(kind, filename),
+                           total=export_total(df, filename))
+
 @app.route("/reports")
 def reports():
     return render_template("reports.html")
@@ -430,126 +507,241 @@ def report_by_event():
 
 # 📁 List Available Monthly Files (for dropdown)
 @app.route("/get-csv-files")
+@conditional(lambda: data_version())
 def get_csv_files():
-    folder = os.path.join("data", "events")
-    if not os.path.exists(folder):
-        return jsonify({"files": []})
-
-    files = [
-        f for f in os.listdir(folder)
-        if f.endswith(".csv") and f.removesuffix(".csv").isdigit()
-    ]
+    files = [f"{month}.csv" for month in list_months()]
     return jsonify({"files": sorted(files, reverse=True)})
 
+# Yields the rows of a frame REPORT_STREAM_CHUNK at a time,
+# so only one chunk is ever converted to dicts at once.
+def iter_records(df):
+    for start in range(0, len(df), REPORT_STREAM_CHUNK):
+        yield from df.iloc[start:start + REPORT_STREAM_CHUNK].to_dict(orient="records")
+
+# NDJSON: one JSON object per line
+def stream_ndjson(df):
+    for row in iter_records(df):
+        yield app.json.dumps(row) + "\n"
+
+# A regular JSON array, sent in pieces as the rows are serialised
+def stream_json_array(df):
+    yield "["
+    for i, row in enumerate(iter_records(df)):
+        yield ("," if i else "") + app.json.dumps(row)
+    yield "]"
+
 # 📄 Load All Data from File (Sorted Ascending by Date)
+# Optional query arguments:
+#   sort=date|employee|event   row order (default date)
+#   offset=N&limit=N           return one page of rows, so tables can load progressively
+#   stream=ndjson|json         stream the rows instead of building the whole list in memory
 @app.route("/report/render/all/<filename>")
+@conditional(lambda filename: data_version(filename.removesuffix(".csv")))
 def render_full_month_sorted(filename):
-    path = os.path.join("data", "events", filename)
-    if not os.path.isfile(path):
+    df = load_month_file(filename)
+    if df is None:
         return jsonify([])
 
-    df = pd.read_csv(path)
-    df.columns = df.columns.str.strip() 
+    with span("sort"):
+        df = df.sort_values(REPORT_SORTS.get(request.args.get("sort"), ["Date"]), kind="stable")
+    total_rows = len(df)
+
+    offset = max(request.args.get("offset", 0, type=int), 0)
+    limit = request.args.get("limit", type=int)
+    if offset or limit is not None:
+        df = df.iloc[offset:offset + max(limit, 0) if limit is not None else None]
+
+    stream = request.args.get("stream")
+    if stream == "ndjson":
+        response = Response(stream_ndjson(df), mimetype="application/x-ndjson")
+    elif stream == "json":
+        response = Response(stream_json_array(df), mimetype="application/json")
+    else:
+        response = jsonify(df.to_dict(orient="records"))
 
-    if "Date" in df.columns:
-        df["Date"] = pd.to_datetime(df["Date"], errors="coerce")
-        df = df.sort_values("Date", ascending=True)
+    response.headers["X-Total-Count"] = str(total_rows)
+    return response
 
-    return df.to_dict(orient="records")
+# 🧮 Month Totals (overall, per employee and per event)
+# Read from the running totals kept with every save, so the size of the answer
+# depends on the number of employees and events, not on the number of rows.
+@app.route("/report/summary/<filename>")
+@conditional(lambda filename: data_version(filename.removesuffix(".csv")))
+def month_totals(filename):
+    month = filename.removesuffix(".csv")
+    summary = None
+    if filename.endswith(".csv") and month.isdigit():
+        summary = month_summary(month)
+    if summary is None:
+        summary = {"month": month, "rows": 0, "total": 0.0, "by_employee": [], "by_event": []}
+    return jsonify(summary)
 
 # 📄 Export Full Month Data as PDF
 @app.route("/report/pdf/month/<filename>")
 def export_month_pdf(filename):
-    path = os.path.join("data", "events", filename)
-    if not os.path.isfile(path):
-        return "File not found", 404
-
-    df = pd.read_csv(path)
-    df.columns = df.columns.str.strip()
-
-    if "Date" in df.columns:
-        df["Date"] = pd.to_datetime(df["Date"], errors="coerce")
-        df = df.sort_values("Date", ascending=True)
-
-    total = df["Amount Payable"].sum()
-
-    rendered = render_template(
-        "reports/by_date.html",
-         rows=df.to_dict(orient="records"),
-         total=total,
-         export_mode=True
-    )
-    pdf = HTML(string=rendered).write_pdf()
-
-    # Use BytesIO to send PDF as a file response and download it.
-    return send_file(
-        io.BytesIO(pdf),
-        mimetype="application/pdf",
-        download_name=filename.replace(".csv", "_by_date.pdf"),
-        as_attachment=True
-    )
+    return export_report_pdf("month", filename)
 
 # 📄 Render Events by Employee
 @app.route("/report/pdf/employee/<filename>")
 def export_employee_pdf(filename):
-    path = os.path.join("data", "events", filename)
-    if not os.path.isfile(path):
-        return "File not found", 404
-
-    df = pd.read_csv(path)
-    df.columns = df.columns.str.strip()
-
-    if "Date" in df.columns:
-        df["Date"] = pd.to_datetime(df["Date"], errors="coerce")
-        df = df.sort_values(["Surname", "Name", "Date"])
-
-    total = df["Amount Payable"].sum()
-
-    rendered = render_template(
-        "reports/by_employee.html",
-        rows=df.to_dict(orient="records"),
-        total=total,
-        export_mode=True
-    )
-    pdf = HTML(string=rendered).write_pdf()
+    return export_report_pdf("employee", filename)
 
+# 📄 Render Events by Event
+@app.route("/report/pdf/event/<filename>")
+def export_event_pdf(filename):
+    return export_report_pdf("event", filename)
+
+# ⏳ Background Exports
+# Large months are exported as jobs instead, so the request returns straight away:
+#   POST /report/export/<kind>/<filename>   queue an export, returns the job status (202)
+#   GET  /report/export/status/<job_id>     state and progress of the job
+#   GET  /report/export/download/<job_id>   the PDF, once the job is done
+def job_response(status, code=200):
+    return jsonify({
+        **status,
+        "status_url": url_for("export_job_status", job_id=status["id"]),
+        "download_url": url_for("export_job_download", job_id=status["id"])
+    }), code
+
+@app.route("/report/export/<kind>/<filename>", methods=["POST"])
+def submit_export_job(kind, filename):
+    if kind not in REPORT_EXPORTS:
+        return jsonify({"error": f"Unknown report: {kind}"}), 404
+    if load_month_file(filename) is None:
+        return jsonify({"error": "File not found"}), 404
+    return job_response(pdf_jobs.submit_export(kind, filename), 202)
+
+@app.route("/report/export/status/<job_id>")
+def export_job_status(job_id):
+    status = pdf_jobs.read_status(job_id)
+    if status is None:
+        return jsonify({"error": "Unknown job"}), 404
+    return job_response(status)
+
+@app.route("/report/export/download/<job_id>")
+def export_job_download(job_id):
+    status = pdf_jobs.read_status(job_id)
+    if status is None:
+        return "Unknown job", 404
+    if status["state"] != "done":
+        return f"Export is {status['state']}", 409
     return send_file(
-        io.BytesIO(pdf),
+        pdf_jobs.result_path(job_id),
         mimetype="application/pdf",
-        download_name=filename.replace(".csv", "_by_employee.pdf"),
-        as_attachment=True
+        as_attachment=True,
+        download_name=status["download_name"]
     )
 
-# 📄 Render Events by Event
-@app.route("/report/pdf/event/<filename>")
-def export_event_pdf(filename):
-    path = os.path.join("data", "events", filename)
-    if not os.path.isfile(path):
-        return "File not found", 404
+# 🔎 Parse the start/end/employee/event arguments shared by the date-range routes
+# Returns None when the dates are missing or not in YYYY-MM-DD format.
+def range_query_args():
+    try:
+        start = datetime.strptime(request.args.get("start", "").strip(), "%Y-%m-%d")
+        end = datetime.strptime(request.args.get("end", "").strip(), "%Y-%m-%d")
+    except ValueError:
+        return None
+    if end < start:
+        return None
+    return {
+        "start": start,
+        "end": end,
+        "employee_id": request.args.get("employee", "").strip() or None,
+        "event_name": request.args.get("event", "").strip() or None
+    }
 
-    df = pd.read_csv(path)
-    df.columns = df.columns.str.strip()
+# 📆 Rows and Totals Across Months for a Date Range
+# e.g. /report/query?start=2025-03-01&end=2026-02-28&employee=9004123456087
+@app.route("/report/query")
+def report_query():
+    args = range_query_args()
+    if args is None:
+        return jsonify({"error": "start and end must be dates in YYYY-MM-DD format"}), 400
+
+    df = query_events(**args)
+    return jsonify(rows=df.to_dict(orient="records"), totals=summarise(df))
+
+# 📄 Export a Date Range as PDF (sorted by date)
+@app.route("/report/pdf/range")
+def export_range_pdf():
+    args = range_query_args()
+    if args is None:
+        return "start and end must be dates in YYYY-MM-DD format", 400
+
+    df = query_events(**args)
+    period = f"{args['start']:%Y-%m-%d} to {args['end']:%Y-%m-%d}"
+
+    return send_report_pdf(
+        df, "reports/by_date.html",
+        f"{args['start']:%Y%m%d}_{args['end']:%Y%m%d}_by_date.pdf",
+        period=period
+    )
 
-    if "Date" in df.columns:
-        df["Date"] = pd.to_datetime(df["Date"], errors="coerce")
-        df = df.sort_values(["Event Name", "Date"])
+# ────────────────────────────────────────────────
+# 📈 Metrics
+# ────────────────────────────────────────────────
 
-    total = df["Amount Payable"].sum()
+# Request and stage timings of this process, in the Prometheus text format
+@app.route("/metrics")
+def metrics():
+    return Response(instrumentation.render_metrics(), mimetype="text/plain; version=0.0.4")
 
-    rendered = render_template(
-        "reports/by_event.html",
-        rows=df.to_dict(orient="records"),
-        total=total,
-        export_mode=True
-    )
-    pdf = HTML(string=rendered).write_pdf()
+# ────────────────────────────────────────────────
+# 🧽 Data Migration
+# ────────────────────────────────────────────────
 
-    return send_file(
-        io.BytesIO(pdf),
-        mimetype="application/pdf",
-        download_name=filename.replace(".csv", "_by_event.pdf"),
-        as_attachment=True
-    )
+# Strips stray spaces from the employee file and every monthly event file.
+# New data is stripped when it is saved, this cleans up files written before that.
+# Run with: flask --app app normalise-data
+@app.cli.command("normalise-data")
+def normalise_data():
+    if STORAGE_BACKEND == "sqlite":
+        print("SQLite data is stripped when it is saved, nothing to do.")
+        return
+
+    changed = employee_store.normalise()
+    print(f"{EMPLOYEE_CSV}: {'normalised' if changed else 'already clean'}")
+
+    for month in list_csv_months():
+        if is_archived(month):
+            print(f"{month}.csv: archived, left as it is")
+            continue
+        changed = normalise_month(month)
+        print(f"{month}.csv: {'normalised' if changed else 'already clean'}")
+
+# Rolls closed months into one zip per year (see event_archive.py). Archived months
+# are listed and read like any other month.
+# Run with: flask --app app compact-events [--before YYYYMM]
+@app.cli.command("compact-events")
+@click.option("--before", help="Archive the months before this one (YYYYMM) instead of every closed month.")
+def compact_events(before):
+    if STORAGE_BACKEND == "sqlite":
+        print("SQLite keeps events in the database, there are no month files to archive.")
+        return
+    if before is not None and not (len(before) == 6 and before.isdigit()):
+        raise click.BadParameter("expected a month as YYYYMM", param_hint="--before")
+
+    archived = event_archive.compact(before)
+    if not archived:
+        print("No closed months to archive.")
+    for year, months in sorted(archived.items()):
+        print(f"{archive_path(year)}: archived {', '.join(months)}")
+
+# Copies the CSV files into the SQLite database (replacing what is in it),
+# before switching STORAGE_BACKEND to "sqlite".
+# Run with: flask --app app import-sqlite
+@app.cli.command("import-sqlite")
+def import_sqlite():
+    employees, rows, skipped = sqlite_store.import_csv()
+    print(f"Imported {employees} employees and {rows} event rows into {sqlite_store.SQLITE_PATH}")
+    if skipped:
+        print(f"Skipped {skipped} event rows with an invalid date or amount")
+
+# Writes the SQLite database back out to the CSV files, e.g. to switch back to "csv".
+# Run with: flask --app app export-csv
+@app.cli.command("export-csv")
+def export_csv():
+    employees, months = sqlite_store.export_csv()
+    print(f"Exported {employees} employees and {months} months of events to CSV")
 
 # ⚙️ Launch Flask Development Server
 if __name__ == "__main__":
@@ -0,0 +1,134 @@
+# ──────────────────────────────────────
+# 🧮 Benchmark: Event Frame Memory
+# ──────────────────────────────────────
+# Generates one large synthetic month (see synthetic_data.py) and loads it the
+# way the app used to (every column as Python strings, then Date and Amount
+# Payable converted) and the way it does now (the compact typed frame, parsed
+# from the CSV and memory-mapped from the Feather sidecar). For every loader it
+# reports the in-memory size of the frame, the RSS it added and the load time.
+#
+# Each loader runs in its own Python process, so one loader's memory is not
+# counted against the next.
+#
+# Run from the project root:
+#   python benchmarks/memory.py
+#   python benchmarks/memory.py --rows 1000000 --employees 10000 --json
+
+import argparse
+import json
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+LOADERS = ["strings", "typed_csv", "sidecar"]
+
+
+def rss_mb():
+    # Current RSS from /proc on Linux, the peak from getrusage elsewhere
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except OSError:
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+# ──────────────────────────────────────
+# 📦 One Loader (runs in a child process)
+# ──────────────────────────────────────
+
+def load(loader, month):
+    import pandas as pd
+    import event_store
+
+    if loader == "strings":
+        path = event_store.month_csv_path(month)
+        df = pd.read_csv(path, encoding=event_store.CSV_ENCODING, dtype=str, keep_default_na=False)
+        df["Date"] = pd.to_datetime(df["Date"], errors="coerce")
+        df["Amount Payable"] = pd.to_numeric(df["Amount Payable"], errors="coerce")
+        return df
+    if loader == "typed_csv":
+        return event_store.read_month_csv(month)
+    return event_store.load_month(month)
+
+
+def run_loader(loader, month):
+    import pandas  # noqa: F401, imported up front so its own memory isn't counted
+    import event_store
+
+    if loader == "sidecar":
+        # Build the sidecar first, so the measured load only maps it
+        event_store.load_month(month)
+
+    before = rss_mb()
+    start = time.perf_counter()
+    df = load(loader, month)
+    elapsed = time.perf_counter() - start
+    added = rss_mb() - before
+
+    return {
+        "rows": len(df),
+        "frame_mb": round(df.memory_usage(deep=True).sum() / (1024 * 1024), 2),
+        "rss_added_mb": round(added, 1),
+        "load_ms": round(elapsed * 1000, 1),
+        "dtypes": {col: str(dtype) for col, dtype in df.dtypes.items()}
+    }
+
+
+# ──────────────────────────────────────
+# 🧭 Harness
+# ──────────────────────────────────────
+
+def run_in_child(loader, month, workdir):
+    command = [sys.executable, os.path.abspath(__file__), "--worker", loader, "--month", month]
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([PROJECT_ROOT, os.environ.get("PYTHONPATH", "")]))
+    result = subprocess.run(command, cwd=workdir, env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        return {"error": result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "failed"}
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the memory of the event frame loaders.")
+    parser.add_argument("--rows", type=int, default=200000, help="event rows in the month")
+    parser.add_argument("--employees", type=int, default=1000, help="employees in the synthetic data set")
+    parser.add_argument("--seed", type=int, default=0, help="random seed for the data")
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    parser.add_argument("--worker", choices=LOADERS, help=argparse.SUPPRESS)
+    parser.add_argument("--month", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_loader(args.worker, args.month)))
+        return
+
+    from benchmarks.synthetic_data import generate
+
+    workdir = tempfile.mkdtemp(prefix="form-easy-memory-")
+    try:
+        month = generate(workdir, args.employees, args.rows, months=1, seed=args.seed)[-1]
+        results = {loader: run_in_child(loader, month, workdir) for loader in LOADERS}
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    if args.json:
+        print(json.dumps({"rows": args.rows, "employees": args.employees, "loaders": results}, indent=2))
+        return
+
+    print(f"{args.rows} rows, {args.employees} employees")
+    for loader, result in results.items():
+        summary = result.get("error") or (
+            f"frame {result['frame_mb']:8.1f} MB   rss +{result['rss_added_mb']:7.1f} MB   "
+            f"load {result['load_ms']:8.1f} ms")
+        print(f"{loader:<10} {summary}")
+
+
+if __name__ == "__main__":
+    main()
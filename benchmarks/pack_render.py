@@ -0,0 +1,79 @@
+# ──────────────────────────────────────
+# ⏱️ Benchmark: Employee Form Pack Rendering
+# ──────────────────────────────────────
+# Compares the old way of building a pack (three separate WeasyPrint documents,
+# each parsing its own stylesheet, spliced together page by page) with the
+# single-pass renderer in pdf_forms.py.
+#
+# The forms are now fragments styled by the shared forms/forms.css, so the "before"
+# numbers come from copies of the three original standalone templates, each with
+# its own <style> block, kept in benchmarks/baseline_forms.
+#
+# Run from the project root:
+#   python benchmarks/pack_render.py --packs 20
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from jinja2 import Environment, FileSystemLoader
+from weasyprint import HTML
+
+from pdf_forms import render_employee_pack
+from utils import get_employer_info
+
+BASELINE_FORMS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline_forms")
+BASELINE_TEMPLATES = ["employment_agreement.html", "wage_claim.html", "payment_acknowledgment.html"]
+baseline_env = Environment(loader=FileSystemLoader(BASELINE_FORMS))
+
+EMPLOYEE = {"ID Number": "9004123456087", "Surname": "Molewa", "Name": "Thabo", "Contact": "0634567890"}
+EVENT = {"Name": "Cleaning Shop", "Date": "2025-05-01", "AmountPayable": "231.50"}
+
+
+# The previous approach, as pdf_forms.py had it: one render per standalone form,
+# with the CSS and fonts set up from scratch every time.
+def render_pack_three_pass(employee, event, employer):
+    doc = HTML(string=baseline_env.get_template(BASELINE_TEMPLATES[0]).render(
+        employee=employee, event=event, employer=employer)).render()
+
+    for tpl in BASELINE_TEMPLATES[1:]:
+        sub = HTML(string=baseline_env.get_template(tpl).render(
+            employee=employee, event=event, employer=employer)).render()
+        doc.pages.extend(sub.pages)
+
+    return doc.write_pdf()
+
+
+def time_renders(render, packs):
+    employer = get_employer_info()
+    timings = []
+    for _ in range(packs):
+        start = time.perf_counter()
+        render(EMPLOYEE, EVENT, employer)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time employee form pack rendering.")
+    parser.add_argument("--packs", type=int, default=20, help="packs to render per approach")
+    args = parser.parse_args()
+
+    # Warm up both paths once so template compilation is not part of the numbers
+    employer = get_employer_info()
+    render_pack_three_pass(EMPLOYEE, EVENT, employer)
+    render_employee_pack(EMPLOYEE, EVENT, employer)
+
+    for label, render in [("three-pass (before)", render_pack_three_pass),
+                          ("single-pass (after)", render_employee_pack)]:
+        timings = time_renders(render, args.packs)
+        print(f"{label:<22} mean {statistics.mean(timings):8.1f} ms   "
+              f"median {statistics.median(timings):8.1f} ms   per pack over {args.packs} packs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+# ──────────────────────────────────────
+# ⏱️ Benchmark: Flask Routes
+# ──────────────────────────────────────
+# Generates a synthetic data set (see synthetic_data.py) in a scratch folder and
+# drives the main routes through Flask's test client. For every route it reports
+# latency percentiles, throughput and peak RSS as JSON, so the numbers of two
+# commits can be compared.
+#
+# Each route runs in its own Python process, so the peak RSS of one route is not
+# hidden behind the peak of an earlier one. The PDF cache is cleared before every
+# PDF request (unless --warm-cache is given), so the PDF routes time real renders.
+#
+# Run from the project root:
+#   python benchmarks/routes.py --employees 10000 --events 100000 --out bench.json
+#   python benchmarks/routes.py --routes get_events report_render_all --requests 200
+
+import argparse
+import json
+import os
+import random
+import resource
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+# Route name → (method, whether it renders a PDF). Routes run in this order;
+# events_post runs last because it adds rows to the data set.
+ROUTES = {
+    "get_events": ("GET", False),
+    "report_render_all": ("GET", False),
+    "report_pdf_month": ("GET", True),
+    "report_pdf_employee": ("GET", True),
+    "report_pdf_event": ("GET", True),
+    "generate_employee_pdf": ("GET", True),
+    "events_post": ("POST", False)
+}
+
+# Employees assigned to each event saved by events_post
+ASSIGN_PER_EVENT = 50
+
+
+def percentile(sorted_values, pct):
+    index = min(len(sorted_values) - 1, round(pct / 100 * (len(sorted_values) - 1)))
+    return sorted_values[index]
+
+
+def peak_rss_mb():
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+# ──────────────────────────────────────
+# 🔁 One Route (runs in a child process)
+# ──────────────────────────────────────
+
+# The requests to send to a route: a list of (url, form data) pairs.
+def build_requests(route, count, month, rng, app_module):
+    import pandas as pd
+
+    events = pd.read_csv(os.path.join("data", "events", f"{month}.csv"), dtype=str)
+    filename = f"{month}.csv"
+
+    if route == "get_events":
+        return [(f"/get-events/{month}", None)] * count
+    if route == "report_render_all":
+        return [(f"/report/render/all/{filename}", None)] * count
+    if route.startswith("report_pdf_"):
+        return [(f"/report/pdf/{route.removeprefix('report_pdf_')}/{filename}", None)] * count
+    if route == "generate_employee_pdf":
+        rows = events.sample(n=count, replace=True, random_state=rng.randrange(2**32))
+        return [(f"/generate-employee-pdf/{r['Employee ID']}/{r['Date']}", None) for _, r in rows.iterrows()]
+    if route == "events_post":
+        ids = [e["ID Number"] for e in app_module.employee_store.records()]
+        first_day = pd.Timestamp(f"{month[:4]}-{month[4:]}-01")
+        return [("/events", {
+            "eventName": rng.choice(["Cleaning Shop", "Offload Truck"]),
+            "eventDate": (first_day + pd.Timedelta(days=rng.randrange(first_day.days_in_month))).strftime("%Y-%m-%d"),
+            "amountPayable": "200.00",
+            "assignedEmployees": json.dumps(rng.sample(ids, min(ASSIGN_PER_EVENT, len(ids))))
+        }) for _ in range(count)]
+    raise ValueError(f"Unknown route: {route}")
+
+
+def run_route(route, count, month, warm_cache, seed):
+    rss_before_import = peak_rss_mb()
+    import app as app_module
+    from config import PDF_CACHE_DIR
+
+    client = app_module.app.test_client()
+    rng = random.Random(seed)
+    requests = build_requests(route, count, month, rng, app_module)
+    method, renders_pdf = ROUTES[route]
+    rss_after_import = peak_rss_mb()
+
+    timings, statuses = [], {}
+    started = time.perf_counter()
+    for url, data in requests:
+        if renders_pdf and not warm_cache:
+            paused = time.perf_counter()
+            shutil.rmtree(PDF_CACHE_DIR, ignore_errors=True)
+            started += time.perf_counter() - paused
+
+        start = time.perf_counter()
+        response = client.post(url, data=data) if method == "POST" else client.get(url)
+        response.get_data()
+        timings.append((time.perf_counter() - start) * 1000)
+        statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+    elapsed = time.perf_counter() - started
+
+    timings.sort()
+    return {
+        "requests": len(timings),
+        "statuses": {str(code): n for code, n in sorted(statuses.items())},
+        "mean_ms": round(statistics.mean(timings), 3),
+        "p50_ms": round(percentile(timings, 50), 3),
+        "p90_ms": round(percentile(timings, 90), 3),
+        "p99_ms": round(percentile(timings, 99), 3),
+        "max_ms": round(timings[-1], 3),
+        "throughput_rps": round(len(timings) / elapsed, 3) if elapsed else None,
+        "rss_at_start_mb": round(rss_before_import, 1),
+        "rss_after_import_mb": round(rss_after_import, 1),
+        "peak_rss_mb": round(peak_rss_mb(), 1)
+    }
+
+
+# ──────────────────────────────────────
+# 🧭 Harness
+# ──────────────────────────────────────
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# A scratch folder the app can run in: generated data, plus links to the templates.
+def prepare_workdir(args):
+    from benchmarks.synthetic_data import generate
+
+    workdir = tempfile.mkdtemp(prefix="form-easy-bench-")
+    months = generate(workdir, args.employees, args.events, args.months, seed=args.seed)
+    for folder in ["templates", "static"]:
+        os.symlink(os.path.join(PROJECT_ROOT, folder), os.path.join(workdir, folder))
+    return workdir, months[-1]
+
+
+# Runs this script again in `--worker` mode for one route and returns its JSON result.
+def run_in_child(route, count, month, args, workdir):
+    command = [sys.executable, os.path.abspath(__file__), "--worker", route,
+               "--requests", str(count), "--month", month, "--seed", str(args.seed)]
+    if args.warm_cache:
+        command.append("--warm-cache")
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([PROJECT_ROOT, os.environ.get("PYTHONPATH", "")]))
+    result = subprocess.run(command, cwd=workdir, env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        return {"error": result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "failed"}
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the Flask routes against a synthetic data set.")
+    parser.add_argument("--employees", type=int, default=1000, help="employees in the synthetic data set")
+    parser.add_argument("--events", type=int, default=10000, help="event rows in the synthetic data set")
+    parser.add_argument("--months", type=int, default=12, help="monthly event files to spread the rows over")
+    parser.add_argument("--requests", type=int, default=50, help="requests per route")
+    parser.add_argument("--pdf-requests", type=int, default=5, help="requests per PDF route")
+    parser.add_argument("--routes", nargs="+", choices=list(ROUTES), default=list(ROUTES), help="routes to run")
+    parser.add_argument("--warm-cache", action="store_true", help="keep the PDF cache between requests")
+    parser.add_argument("--seed", type=int, default=0, help="random seed for the data and the requests")
+    parser.add_argument("--out", help="write the JSON results to this file instead of stdout")
+    parser.add_argument("--keep", action="store_true", help="keep the scratch data folder")
+    parser.add_argument("--worker", choices=list(ROUTES), help=argparse.SUPPRESS)
+    parser.add_argument("--month", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_route(args.worker, args.requests, args.month, args.warm_cache, args.seed)))
+        return
+
+    workdir, month = prepare_workdir(args)
+    results = {
+        "commit": git_commit(),
+        "python": sys.version.split()[0],
+        "data": {"employees": args.employees, "events": args.events, "months": args.months, "month": month},
+        "warm_cache": args.warm_cache,
+        "routes": {}
+    }
+    try:
+        for route in ROUTES:
+            if route not in args.routes:
+                continue
+            count = args.pdf_requests if ROUTES[route][1] else args.requests
+            results["routes"][route] = result = run_in_child(route, count, month, args, workdir)
+            summary = result.get("error") or (
+                f"p50 {result['p50_ms']:9.2f} ms   p99 {result['p99_ms']:9.2f} ms   "
+                f"{result['throughput_rps']:8.2f} req/s   peak {result['peak_rss_mb']:7.1f} MB")
+            print(f"{route:<22} {summary}", file=sys.stderr)
+    finally:
+        if args.keep:
+            print(f"Data kept in {workdir}", file=sys.stderr)
+        else:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    output = json.dumps(results, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+# ──────────────────────────────────────
+# ⏱️ Benchmark: App Startup
+# ──────────────────────────────────────
+# Imports app.py in a fresh interpreter with `python -X importtime` and reports
+# how long the import took, which heavy libraries were imported on the way and
+# the slowest imports. Run it with and without --preload (which sets
+# PRELOAD_HEAVY_MODULES for that run) to see what lazy loading saves a new worker.
+#
+# Run from the project root:
+#   python benchmarks/startup.py
+#   python benchmarks/startup.py --preload --runs 5 --json
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY_MODULES = ["weasyprint", "pandas", "pyarrow", "PyPDF2"]
+
+# Imports the app the way a worker does and lists which heavy modules got imported.
+IMPORT_APP = """
+import sys, time
+start = time.perf_counter()
+import config
+config.PRELOAD_HEAVY_MODULES = {preload}
+import app
+print("WALL", time.perf_counter() - start)
+print("LOADED", ",".join(m for m in {heavy!r} if m in sys.modules))
+"""
+
+
+# Parses the `import time: self [us] | cumulative | imported package` lines into
+# (name, nesting depth, cumulative ms). Nested imports are indented two spaces per level.
+def parse_importtime(stderr):
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        _, cumulative_us, name = line.removeprefix("import time:").split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        imports.append((name.strip(), depth, int(cumulative_us) / 1000))
+    return imports
+
+
+def run_once(preload):
+    code = IMPORT_APP.format(preload=preload, heavy=HEAVY_MODULES)
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                            cwd=PROJECT_ROOT, capture_output=True, text=True, check=True)
+    wall = loaded = None
+    for line in result.stdout.splitlines():
+        if line.startswith("WALL "):
+            wall = float(line.split()[1])
+        elif line.startswith("LOADED "):
+            loaded = [m for m in line.split(" ", 1)[1].split(",") if m]
+    return wall, loaded, parse_importtime(result.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time importing the app in a fresh interpreter.")
+    parser.add_argument("--runs", type=int, default=3, help="fresh interpreters to start")
+    parser.add_argument("--preload", action="store_true", help="set PRELOAD_HEAVY_MODULES for the run")
+    parser.add_argument("--top", type=int, default=10, help="slowest imports of app.py to list")
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    args = parser.parse_args()
+
+    walls, loaded, imports = [], [], []
+    for _ in range(args.runs):
+        wall, loaded, imports = run_once(args.preload)
+        walls.append(wall * 1000)
+
+    # The slowest modules imported directly by app.py in the last run
+    # (their cumulative time includes everything they import in turn)
+    direct = [(name, ms) for name, depth, ms in imports if depth == 1]
+    slowest = sorted(direct, key=lambda item: item[1], reverse=True)[:args.top]
+
+    results = {
+        "preload": args.preload,
+        "runs": args.runs,
+        "import_app_ms": {"median": round(statistics.median(walls), 1), "min": round(min(walls), 1)},
+        "heavy_modules_loaded": loaded,
+        "slowest_imports_ms": {name: round(ms, 1) for name, ms in slowest}
+    }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"import app: median {results['import_app_ms']['median']:.1f} ms, "
+          f"min {results['import_app_ms']['min']:.1f} ms over {args.runs} runs"
+          f"{' (preload)' if args.preload else ''}")
+    print(f"heavy modules imported: {', '.join(loaded) or 'none'}")
+    print("slowest imports of app.py:")
+    for name, ms in slowest:
+        print(f"  {name:<30} {ms:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
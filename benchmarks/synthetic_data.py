@@ -0,0 +1,96 @@
+# ──────────────────────────────────────
+# 🧪 Synthetic Data Generator
+# ──────────────────────────────────────
+# Writes an employee_data.csv and one data/events/YYYYMM.csv per month, in the
+# same format the app writes, at any size. Used by benchmarks/routes.py, but it
+# can also be run on its own to try the app with a large data set.
+#
+# Run from the project root (writes into the folder given with --out):
+#   python benchmarks/synthetic_data.py --out /tmp/form-easy --employees 10000 --events 100000
+
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+SURNAMES = ["Molewa", "van der Merwe", "Ngwenya", "Mokgosi", "Dlamini", "Naidoo", "Botha",
+            "Khumalo", "Pillay", "Smith", "Zulu", "Nkosi", "Pretorius", "Mahlangu", "Jacobs"]
+NAMES = ["Thabo", "Elsie", "Sipho", "Lerato", "Johan", "Priya", "Anele", "Kagiso",
+         "Nomsa", "Pieter", "Zanele", "Themba", "Ayesha", "Bongani", "Ruan"]
+EVENT_NAMES = ["Cleaning Shop", "Offload Truck", "Assist in Store Rooms", "Assist in Shop"]
+AMOUNTS = [150.00, 180.50, 200.00, 231.50, 250.00, 300.00]
+
+
+# Employees with unique 13-digit ID numbers and 10-digit contact numbers.
+def make_employees(count, rng):
+    return pd.DataFrame({
+        "ID Number": (8000000000000 + rng.choice(10**12, size=count, replace=False)).astype(str),
+        "Surname": rng.choice(SURNAMES, size=count),
+        "Name": rng.choice(NAMES, size=count),
+        "Contact": ["0" + str(n) for n in rng.integers(600000000, 899999999, size=count)]
+    })
+
+
+# The last `count` months up to and including `last` (YYYYMM), oldest first.
+def month_range(last, count):
+    end = pd.Period(f"{last[:4]}-{last[4:]}", freq="M")
+    return [str(end - i).replace("-", "") for i in reversed(range(count))]
+
+
+# Event rows for one month: each row assigns a random employee to one of the
+# events of a random day, the way the /events form builds them.
+def make_month(month, rows, employees, rng):
+    start = pd.Timestamp(f"{month[:4]}-{month[4:]}-01")
+    days = rng.integers(0, start.days_in_month, size=rows)
+    staff = employees.iloc[rng.integers(0, len(employees), size=rows)].reset_index(drop=True)
+    df = pd.DataFrame({
+        "Event Name": rng.choice(EVENT_NAMES, size=rows),
+        "Date": (start + pd.to_timedelta(days, unit="D")).strftime("%Y-%m-%d"),
+        "Amount Payable": [f"{a:.2f}" for a in rng.choice(AMOUNTS, size=rows)],
+        "Employee ID": staff["ID Number"],
+        "Name": staff["Name"],
+        "Surname": staff["Surname"],
+        "Contact": staff["Contact"]
+    })
+    return df.sort_values(["Date", "Event Name"], kind="stable")
+
+
+# Writes <out>/data/employees/employee_data.csv and <out>/data/events/YYYYMM.csv.
+# The event rows are spread evenly over the months. Returns the months written.
+def generate(out, employees=1000, events=10000, months=12, last_month="202512", seed=0):
+    rng = np.random.default_rng(seed)
+    employee_dir = os.path.join(out, "data", "employees")
+    event_dir = os.path.join(out, "data", "events")
+    os.makedirs(employee_dir, exist_ok=True)
+    os.makedirs(event_dir, exist_ok=True)
+
+    staff = make_employees(employees, rng)
+    staff.to_csv(os.path.join(employee_dir, "employee_data.csv"), index=False)
+
+    month_list = month_range(last_month, months)
+    per_month = np.full(months, events // months)
+    per_month[:events % months] += 1
+    for month, rows in zip(month_list, per_month):
+        make_month(month, int(rows), staff, rng).to_csv(
+            os.path.join(event_dir, f"{month}.csv"), index=False)
+    return month_list
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic employee and event CSV files.")
+    parser.add_argument("--out", required=True, help="folder to write data/employees and data/events into")
+    parser.add_argument("--employees", type=int, default=1000, help="number of employees")
+    parser.add_argument("--events", type=int, default=10000, help="total event rows, spread over the months")
+    parser.add_argument("--months", type=int, default=12, help="number of monthly event files")
+    parser.add_argument("--last-month", default="202512", help="newest month, as YYYYMM")
+    parser.add_argument("--seed", type=int, default=0, help="random seed, the same seed gives the same files")
+    args = parser.parse_args()
+
+    months = generate(args.out, args.employees, args.events, args.months, args.last_month, args.seed)
+    print(f"Wrote {args.employees} employees and {args.events} event rows "
+          f"({months[0]}–{months[-1]}) to {os.path.join(args.out, 'data')}")
+
+
+if __name__ == "__main__":
+    main()
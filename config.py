@@ -3,6 +3,81 @@
 # 📁 File paths
 EMPLOYEE_CSV = "data/employees/employee_data.csv"
 EVENT_FOLDER = "data/events"
+# Closed months are rolled into one zip per year here. Run with: flask --app app compact-events
+EVENT_ARCHIVE_FOLDER = "data/events/archive"
+# Months that stay loose CSVs when compacting, counting the current month,
+# so events saved late for a recent month are still a cheap append
+ARCHIVE_OPEN_MONTHS = 3
+
+# 🗄️ Storage backend
+# "csv" keeps everything in the files above. "sqlite" keeps employees and events in one
+# SQLite database instead, with indexed lookups. Fill it with: flask --app app import-sqlite
+STORAGE_BACKEND = "csv"
+SQLITE_PATH = "data/form_easy.db"
+
+
+# 🖨️ PDF rendering
+# Number of worker processes used when rendering form packs for a whole event,
+# and the chunks of a large report
+PDF_WORKERS = 4
+
+# Reports with more rows than this are rendered in chunks that end on an employee, event
+# or day, in parallel, and merged into one PDF. WeasyPrint's time and memory grow faster
+# than the table, so smaller chunks keep both in check.
+REPORT_CHUNK_ROWS = 2000
+# Memory each PDF render worker may allocate on top of what it starts with, in MB. A chunk
+# or pack that needs more fails with a MemoryError instead of pushing the server into swap.
+# None switches the limit off.
+REPORT_WORKER_MEMORY_MB = 1024
+
+# Rendered PDFs are cached on disk, the oldest are removed once the folder passes this size
+PDF_CACHE_DIR = "data/cache/pdf"
+PDF_CACHE_MAX_BYTES = 200 * 1024 * 1024
+
+# Report exports run as background jobs. At most this many render at once per app process,
+# so a big export cannot take over the workers that serve the pages.
+PDF_JOB_WORKERS = 2
+PDF_JOB_DIR = "data/jobs"
+# Finished jobs (and their PDFs) are removed after this many seconds
+PDF_JOB_TTL = 60 * 60
+
+
+# 📊 Reports
+# Number of months read in parallel by a date-range report query
+REPORT_QUERY_WORKERS = 4
+# Rows serialised at a time when a report is streamed
+REPORT_STREAM_CHUNK = 500
+
+
+# 🧠 Templates
+# Compiled Jinja templates are cached here, so new workers don't compile them again
+TEMPLATE_CACHE_DIR = "data/cache/templates"
+# Check the PDF templates for changes on every render. Turn on while editing them,
+# keep off in production.
+TEMPLATE_AUTO_RELOAD = False
+
+
+# 🗜️ HTTP responses
+# Text and JSON responses of at least this many bytes are compressed, with brotli when the
+# brotli package is installed and the browser accepts it, otherwise with gzip.
+COMPRESS_MIN_BYTES = 1024
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+
+# 💤 Startup
+# WeasyPrint, pandas, pyarrow and PyPDF2 are imported on first use. Set to True to
+# import them when the app starts instead (e.g. together with gunicorn --preload).
+PRELOAD_HEAVY_MODULES = False
+
+
+# ⏱️ Instrumentation
+# Set to a number of milliseconds to profile every request and keep the profile
+# of any request slower than that in PROFILE_DIR. None switches profiling off.
+PROFILE_SLOW_MS = None
+PROFILE_DIR = "data/profiles"
+# "cprofile" (always available) or "pyinstrument" (if it is installed)
+PROFILER = "cprofile"
 
 
 # 🎨 UI Config
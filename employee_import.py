@@ -0,0 +1,87 @@
+from config import CSV_ENCODING
+from lazy_imports import lazy_import
+from instrumentation import span
+from safe_write import normalise_frame
+from employee_store import EMPLOYEE_COLUMNS
+
+pd = lazy_import("pandas")
+
+# ──────────────────────────────────────
+# 📥 Bulk Employee Import
+# ──────────────────────────────────────
+
+# Loads a whole CSV of employees at once instead of one form post per person.
+# Every row is checked with the rules of the add form, plus a check for an ID that
+# appears twice in the file, one vectorised check per rule over the whole upload,
+# and the rows that pass are written in a single save. Rows for an ID that already
+# exists update that employee, unless the import runs in "insert" mode, where they
+# are reported as duplicates.
+
+IMPORT_MODES = ("upsert", "insert")
+
+# Each rule is a message and a check that returns a boolean Series, True for the bad rows.
+# The add form's rules use the messages the form shows. Like the form, blank names are accepted.
+def _rules(df, existing_ids, mode):
+    ids, contacts = df["ID Number"], df["Contact"]
+    valid_id = ids.str.isdigit() & (ids.str.len() == 13)
+    rules = [
+        ("ID number must be a 13-digit number.", ~valid_id),
+        ("Contact must be at least 10 digits.", ~(contacts.str.isdigit() & (contacts.str.len() >= 10))),
+        ("This ID number appears more than once in the file.", valid_id & ids.duplicated(keep=False))
+    ]
+    if mode == "insert":
+        rules.append(("An employee with this ID number already exists.", ids.isin(existing_ids)))
+    return rules
+
+# Reads an uploaded CSV as text, so IDs and contacts keep their leading zeros.
+# Raises ValueError when the file can't be read or misses a column.
+def read_upload(stream):
+    try:
+        with span("read_csv"):
+            df = pd.read_csv(stream, encoding=CSV_ENCODING, dtype=str, keep_default_na=False)
+    except (UnicodeDecodeError, pd.errors.ParserError, pd.errors.EmptyDataError) as e:
+        raise ValueError(f"The file could not be read as a CSV: {e}") from e
+
+    df = normalise_frame(df)
+    missing = [col for col in EMPLOYEE_COLUMNS if col not in df.columns]
+    if missing:
+        raise ValueError(f"Missing columns: {', '.join(missing)}")
+    return df[EMPLOYEE_COLUMNS]
+
+# Splits the upload into the rows that can be saved and a report of the rows that can't.
+# Rows are numbered the way a spreadsheet shows them, the header being row 1.
+def validate(df, existing_ids, mode="upsert"):
+    rules = _rules(df, existing_ids, mode)
+    bad = pd.concat([mask.rename(message) for message, mask in rules], axis=1)
+    is_bad = bad.any(axis=1)
+
+    errors = [
+        {
+            "row": int(position) + 2,
+            "id_number": df["ID Number"].iat[position],
+            "errors": [message for message, failed in zip(bad.columns, flags) if failed]
+        }
+        for position, flags in zip(is_bad.to_numpy().nonzero()[0], bad[is_bad].itertuples(index=False))
+    ]
+    return df[~is_bad], errors
+
+# Validates an upload and saves its valid rows to the store in one write.
+# With dry_run nothing is saved, the report shows what would happen.
+def import_employees(stream, store, mode="upsert", dry_run=False):
+    df = read_upload(stream)
+    existing_ids = store.frame()["ID Number"].str.strip()
+    valid, errors = validate(df, existing_ids, mode)
+
+    updated = int(valid["ID Number"].isin(existing_ids).sum())
+    inserted = len(valid) - updated
+    if not dry_run and not valid.empty:
+        inserted, updated = store.upsert_many(valid)
+
+    return {
+        "rows": len(df),
+        "inserted": inserted,
+        "updated": updated,
+        "skipped": len(errors),
+        "errors": errors,
+        "dry_run": dry_run
+    }
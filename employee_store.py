@@ -0,0 +1,180 @@
+import os
+import threading
+from lazy_imports import lazy_import
+from config import EMPLOYEE_CSV, CSV_ENCODING
+from instrumentation import span
+from safe_write import file_lock, atomic_write_csv, normalise_frame
+from employee_search import PrefixIndex
+
+pd = lazy_import("pandas")
+
+# ──────────────────────────────────────
+# 👥 In-Process Employee Store
+# ──────────────────────────────────────
+
+# The column order used by employee_data.csv.
+EMPLOYEE_COLUMNS = ["ID Number", "Surname", "Name", "Contact"]
+
+
+# The store parses employee_data.csv once and keeps it in memory.
+# Records are indexed by ID Number in a dict, and a copy sorted by Surname
+# is kept ready for the dropdowns. The file is only parsed again when its
+# mtime or size changes, so edits made outside the app are still picked up.
+# The search index behind the employee typeahead is built from the Surname view
+# on the first search after a reload.
+class EmployeeStore:
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.RLock()
+        self._signature = None
+        self._frame = None
+        self._by_id = {}
+        self._by_surname = []
+        self._search_index = None
+
+    # mtime + size is cheap to check with a single stat call.
+    def _file_signature(self):
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    # Every value is kept as a string so IDs and contacts keep their leading zeros.
+    def _read_csv(self):
+        try:
+            with span("read_csv"):
+                df = pd.read_csv(self.path, encoding=CSV_ENCODING, dtype=str, keep_default_na=False)
+        except (FileNotFoundError, pd.errors.EmptyDataError):
+            df = pd.DataFrame(columns=EMPLOYEE_COLUMNS)
+        return df
+
+    # Rebuilds the ID index and the Surname view from a DataFrame.
+    def _build(self, df, signature):
+        records = df.to_dict(orient="records")
+        self._frame = df
+        self._by_id = {str(r["ID Number"]).strip(): r for r in records}
+        self._by_surname = df.sort_values("Surname", kind="stable").to_dict(orient="records")
+        self._search_index = None
+        self._signature = signature
+
+    # Reload only when the file on disk no longer matches what we have in memory.
+    def _refresh(self):
+        signature = self._file_signature()
+        if signature == self._signature and self._frame is not None:
+            return
+        with self._lock:
+            signature = self._file_signature()
+            if signature != self._signature or self._frame is None:
+                self._build(self._read_csv(), signature)
+
+    # Writes the frame back to disk and swaps it in without re-parsing the file.
+    # Callers hold the file lock, and the atomic replace means readers never see a partial file.
+    # Values are stripped on the way out, so the file on disk never has stray spaces.
+    def _save(self, df):
+        df = normalise_frame(df)
+        atomic_write_csv(df, self.path)
+        self._build(df, self._file_signature())
+
+    # Every write holds the in-process lock and the file lock around its whole
+    # read-modify-write, and re-reads the file first in case another worker changed it.
+    def _locked_write(self, change):
+        with self._lock, file_lock(self.path):
+            self._refresh()
+            self._save(change(self._frame))
+
+    # ── Reads ───────────────────────────────
+
+    def frame(self):
+        self._refresh()
+        return self._frame
+
+    def records(self):
+        self._refresh()
+        return self._frame.to_dict(orient="records")
+
+    def sorted_by_surname(self):
+        self._refresh()
+        return self._by_surname
+
+    def get(self, id_number):
+        self._refresh()
+        return self._by_id.get(str(id_number).strip())
+
+    def __contains__(self, id_number):
+        return self.get(id_number) is not None
+
+    # Looks up many IDs at once, one dict lookup each. Repeated IDs are only returned once.
+    # Returns (employees found, in the order asked for, and the IDs that don't exist).
+    def get_many(self, id_numbers):
+        self._refresh()
+        found, unknown = [], []
+        for id_number in dict.fromkeys(str(i).strip() for i in id_numbers):
+            employee = self._by_id.get(id_number)
+            if employee is None:
+                unknown.append(id_number)
+            else:
+                found.append(employee)
+        return found, unknown
+
+    # Employees whose surname, name or ID number start with the words typed, by surname.
+    # Returns (number of matches, the page of records asked for).
+    def search(self, query, offset=0, limit=20):
+        self._refresh()
+        with self._lock:
+            if self._search_index is None:
+                self._search_index = PrefixIndex(self._by_surname)
+            index = self._search_index
+        return index.search(query, offset, limit)
+
+    # ── Writes ──────────────────────────────
+
+    def add(self, record):
+        new_entry = pd.DataFrame([{col: record.get(col, "") for col in EMPLOYEE_COLUMNS}])
+        self._locked_write(lambda df: pd.concat([df, new_entry], ignore_index=True))
+
+    # Fields the form left out (None) are saved empty.
+    def update(self, id_number, fields):
+        def change(df):
+            df = df.copy()
+            mask = df["ID Number"].str.strip() == str(id_number).strip()
+            for column, value in fields.items():
+                df.loc[mask, column] = "" if value is None else value
+            return df
+        self._locked_write(change)
+
+    # Adds or updates many employees in one write. Existing employees keep their place in
+    # the file, new ones are added at the end. Returns (inserted, updated).
+    def upsert_many(self, records):
+        incoming = records.reindex(columns=EMPLOYEE_COLUMNS, fill_value="")
+        incoming = incoming.set_index(incoming["ID Number"].str.strip(), drop=False)
+        counts = {}
+
+        def change(df):
+            df = df.copy()
+            existing = df["ID Number"].str.strip()
+            is_update = existing.isin(incoming.index)
+            df.loc[is_update, EMPLOYEE_COLUMNS] = incoming.loc[existing[is_update], EMPLOYEE_COLUMNS].to_numpy()
+            added = incoming[~incoming.index.isin(existing)]
+            counts.update(inserted=len(added), updated=len(incoming) - len(added))
+            return pd.concat([df, added], ignore_index=True)
+
+        self._locked_write(change)
+        return counts["inserted"], counts["updated"]
+
+    def remove(self, id_number):
+        self._locked_write(lambda df: df[df["ID Number"].str.strip() != str(id_number).strip()].reset_index(drop=True))
+
+    # Rewrites the file with every value stripped (see the normalise-data command).
+    # Returns False when the file was already clean and nothing was written.
+    def normalise(self):
+        with self._lock, file_lock(self.path):
+            self._refresh()
+            if normalise_frame(self._frame).equals(self._frame):
+                return False
+            self._save(self._frame)
+            return True
+
+
+# One shared store per process, used by every route.
+employee_store = EmployeeStore(EMPLOYEE_CSV)
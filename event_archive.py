@@ -0,0 +1,88 @@
+import os
+import zipfile
+from contextlib import ExitStack
+from datetime import date
+from config import EVENT_ARCHIVE_FOLDER, ARCHIVE_OPEN_MONTHS
+from safe_write import file_lock
+from event_store import (
+    month_csv_path, sidecar_path, index_path, archive_path, archive_member,
+    month_catalogue, invalidate_catalogue
+)
+
+# ──────────────────────────────────────
+# 🗄️ Event Archive Compaction
+# ──────────────────────────────────────
+
+# Rolls closed months into their yearly archive (see "Yearly Archives" in
+# event_store.py). A month is closed once it is older than the last
+# ARCHIVE_OPEN_MONTHS months. Compacting a year writes its archive again with the
+# new months added, swaps it in atomically, and only then removes the loose CSVs,
+# all under the locks of the archive and of every month moved into it.
+#
+# Run with: flask --app app compact-events
+
+# The oldest month that is still open, as YYYYMM.
+def first_open_month(today=None):
+    today = today or date.today()
+    months = today.year * 12 + today.month - max(ARCHIVE_OPEN_MONTHS, 1)
+    return f"{months // 12:04d}{months % 12 + 1:02d}"
+
+# The loose months before `before`, grouped by year.
+def closed_months(before):
+    years = {}
+    for month, archive in sorted(month_catalogue().items()):
+        if archive is None and month < before:
+            years.setdefault(month[:4], []).append(month)
+    return years
+
+# Writes the year's archive again with the months' CSVs added (replacing older copies
+# of them), then swaps it in. Members are kept in month order.
+def _write_archive(year, months):
+    path = archive_path(year)
+    os.makedirs(EVENT_ARCHIVE_FOLDER, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+
+    with ExitStack() as stack:
+        old = stack.enter_context(zipfile.ZipFile(path)) if os.path.exists(path) else None
+        members = {info.filename: info for info in old.infolist()} if old else {}
+        members.update((archive_member(month), month) for month in months)
+
+        with open(tmp_path, "wb") as f:
+            with zipfile.ZipFile(f, "w", zipfile.ZIP_DEFLATED, compresslevel=9) as new:
+                for name, member in sorted(members.items()):
+                    if isinstance(member, zipfile.ZipInfo):
+                        new.writestr(member, old.read(member))
+                    else:
+                        new.write(month_csv_path(member), name)
+            f.flush()
+            os.fsync(f.fileno())
+
+    os.replace(tmp_path, path)
+
+# Moves every loose month before `before` (YYYYMM, default first_open_month()) into its
+# yearly archive. The sidecar and index of a moved month are removed with its CSV,
+# they are rebuilt from the archive on the next read. Returns {year: [months archived]}.
+def compact(before=None):
+    years = closed_months(before or first_open_month())
+    archived = {}
+    for year, months in years.items():
+        with ExitStack() as locks:
+            locks.enter_context(file_lock(archive_path(year)))
+            for month in months:
+                locks.enter_context(file_lock(month_csv_path(month)))
+
+            # Another compaction may have moved some of them while we waited for the locks
+            months = [month for month in months if os.path.exists(month_csv_path(month))]
+            if not months:
+                continue
+            _write_archive(year, months)
+
+            for month in months:
+                for path in (month_csv_path(month), sidecar_path(month), index_path(month)):
+                    try:
+                        os.remove(path)
+                    except FileNotFoundError:
+                        pass
+        archived[year] = months
+        invalidate_catalogue()
+    return archived
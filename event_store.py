@@ -0,0 +1,626 @@
+import csv
+import json
+import os
+import tempfile
+import zipfile
+from contextlib import contextmanager
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+from config import EVENT_FOLDER, EVENT_ARCHIVE_FOLDER, CSV_ENCODING
+from lazy_imports import lazy_import, is_available
+from instrumentation import span
+from safe_write import file_lock, atomic_write_bytes, atomic_write_csv, normalise_frame
+
+pd = lazy_import("pandas")
+np = lazy_import("numpy")
+
+# Feather needs pyarrow. Without it every read simply parses the CSV as before.
+# Both are only imported when the first month is loaded.
+HAS_ARROW = is_available("pyarrow")
+feather = lazy_import("pyarrow.feather")
+pa = lazy_import("pyarrow")
+
+# ──────────────────────────────────────
+# 🔖 Event ID Helpers
+# ──────────────────────────────────────
+
+# These functions encode and decode event IDs based on the event date and name.
+# The event ID is a combination of the date and the event name, formatted for easy retrieval
+def encode_event_id(date_str, name):
+    return f"{date_str}_{name.replace(' ', '_')}"
+
+# This function decodes an event ID back into its date and name components.
+# It splits the ID at the first underscore to separate the date from the name.
+def decode_event_id(event_id):
+    date_part, name_part = event_id.split("_", 1)
+    return date_part, name_part.replace("_", " ")
+
+# ──────────────────────────────────────
+# 🧮 Compact Event Frames
+# ──────────────────────────────────────
+
+# A month frame repeats the same few event names, names and surnames on every row.
+# Kept as Python strings, each of those cells costs a pointer plus a string object,
+# so the frame is several times the size of the file. The typed frame keeps them as
+# categoricals instead (one small integer code per row), the IDs and contact numbers
+# as Arrow strings (one shared buffer), Date as datetime64 and Amount Payable as a
+# float64 of rands.
+#
+# A float64 can't hold most cents exactly, so it is only the nearest value to the
+# amount. Amounts are parsed through Decimal, and totals are added up as integer
+# cents (see amount_cents), so adding many rows can't drift.
+
+# Text that repeats from row to row
+CATEGORY_COLUMNS = ["Event Name", "Name", "Surname"]
+# Text that is mostly different per employee
+STRING_COLUMNS = ["Employee ID", "Contact"]
+
+def _string_dtype():
+    return pd.StringDtype("pyarrow") if HAS_ARROW else object
+
+# Values are stripped in case a file was edited by hand. The work is done once per
+# distinct value, not once per row. Categories are sorted, so sorting by them is alphabetical.
+def _categorical(values):
+    codes, uniques = pd.factorize(values)
+    stripped_codes, categories = pd.factorize(pd.Index(uniques).astype(str).str.strip(), sort=True)
+    codes = np.where(codes >= 0, stripped_codes.take(codes, mode="clip"), -1)
+    return pd.Categorical.from_codes(codes, categories=categories)
+
+# Dates repeat too, so each distinct date is parsed once.
+def _dates(values):
+    codes, uniques = pd.factorize(values)
+    parsed = pd.Series(pd.to_datetime(pd.Index(uniques).astype(str).str.strip(), errors="coerce"))
+    return parsed.reindex(codes).to_numpy()
+
+# An amount as whole cents, or None when it isn't a number.
+def parse_cents(amount):
+    try:
+        value = Decimal(str(amount).strip())
+    except InvalidOperation:
+        return None
+    if not value.is_finite():
+        return None
+    return int((value * 100).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+# Amount Payable as floats, from the cents Decimal parsed. Amounts that can't be parsed become NaN.
+def _amounts(values):
+    codes, uniques = pd.factorize(values)
+    cents = pd.Series([parse_cents(amount) for amount in uniques], dtype="float64")
+    return (cents.reindex(codes) / 100).to_numpy()
+
+# The Amount Payable column as whole cents, with amounts that couldn't be parsed as 0.
+# Also takes a frame that was not built by to_typed_frame, such as an empty object column.
+def amount_cents(df):
+    amounts = pd.to_numeric(df["Amount Payable"], errors="coerce")
+    return (amounts.fillna(0) * 100).round().astype("int64")
+
+# ──────────────────────────────────────
+# 📅 Monthly Event Store
+# ──────────────────────────────────────
+
+# The column order used by every monthly event file.
+EVENT_COLUMNS = ["Event Name", "Date", "Amount Payable", "Employee ID", "Name", "Surname", "Contact"]
+
+# The CSV stays the source of truth. Next to it we keep a Feather sidecar
+# (data/events/YYYYMM.feather) holding the compact typed frame, with the
+# categoricals stored as Arrow dictionaries. Feather files are memory-mapped on read,
+# so opening a month for a report costs almost nothing compared to parsing the CSV.
+#
+# append_rows adds to the CSV under an exclusive file lock. Rebuilding a
+# sidecar or index from the CSV takes the shared lock, so the CSV cannot change
+# halfway through, and the sidecar/index files are always swapped in atomically.
+
+def month_csv_path(month):
+    return os.path.join(EVENT_FOLDER, f"{month}.csv")
+
+def sidecar_path(month):
+    return os.path.join(EVENT_FOLDER, f"{month}.feather")
+
+def _stat(path):
+    try:
+        return os.stat(path) if path else None
+    except FileNotFoundError:
+        return None
+
+def _mtime(path):
+    stat = _stat(path)
+    return stat.st_mtime_ns if stat else None
+
+# The sidecar is only trusted when it was written after the last change to the file the month is read from.
+def sidecar_is_fresh(month):
+    source_mtime = _mtime(month_source(month))
+    sidecar_mtime = _mtime(sidecar_path(month))
+    return source_mtime is not None and sidecar_mtime is not None and sidecar_mtime >= source_mtime
+
+# Turns raw string columns into the compact typed frame the routes work with.
+# Every event frame goes through here, whether it comes from a CSV or from SQLite.
+def to_typed_frame(df):
+    df = df.copy()
+    df.columns = df.columns.str.strip()
+    for col in df.columns.intersection(CATEGORY_COLUMNS):
+        df[col] = _categorical(df[col])
+    for col in df.columns.intersection(STRING_COLUMNS):
+        df[col] = df[col].astype(str).str.strip().astype(_string_dtype())
+    if "Date" in df.columns:
+        df["Date"] = _dates(df["Date"])
+    if "Amount Payable" in df.columns:
+        df["Amount Payable"] = _amounts(df["Amount Payable"])
+    return df
+
+# Stacks typed frames. pandas falls back to plain strings when the categories of the
+# frames differ, so those columns are made categorical again.
+def concat_frames(frames):
+    df = pd.concat(frames, ignore_index=True)
+    for col in df.columns.intersection(CATEGORY_COLUMNS):
+        if not isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype("category")
+    return df
+
+# Parses the month CSV, loose or archived. Every column is read as text first so IDs keep their leading zeros.
+def read_month_csv(month):
+    try:
+        with span("read_csv"), open_month(month) as f:
+            df = pd.read_csv(f, encoding=CSV_ENCODING, dtype=str, keep_default_na=False)
+    except pd.errors.EmptyDataError:
+        df = pd.DataFrame(columns=EVENT_COLUMNS)
+    return to_typed_frame(df)
+
+# Writes the sidecar through a temp file, so a reader never opens a half-written one.
+def write_sidecar(month, df):
+    if not HAS_ARROW:
+        return
+    fd, tmp_path = tempfile.mkstemp(dir=EVENT_FOLDER, suffix=".tmp")
+    os.close(fd)
+    # Uncompressed, so the columns can be memory-mapped straight from the page cache
+    feather.write_feather(df.reset_index(drop=True), tmp_path, compression="uncompressed")
+    os.replace(tmp_path, sidecar_path(month))
+
+# Parses the CSV and writes a new sidecar. The caller holds the month's file lock.
+def _rebuild_sidecar(month):
+    df = read_month_csv(month)
+    write_sidecar(month, df)
+    return df
+
+# Memory-maps a sidecar. Strings come back as Arrow strings, which stay in the mapped file.
+def _read_feather(path):
+    table = feather.read_table(path, memory_map=True)
+    return table.to_pandas(types_mapper=lambda t: (
+        _string_dtype() if pa.types.is_string(t) or pa.types.is_large_string(t) else None))
+
+# The month frame from a fresh sidecar, or None if it has to be rebuilt.
+# Sidecars written before the frames were compact are rebuilt once.
+def _read_sidecar(month):
+    if not (HAS_ARROW and sidecar_is_fresh(month)):
+        return None
+    try:
+        with span("read_feather"):
+            df = _read_feather(sidecar_path(month))
+    except (OSError, ValueError) as e:
+        print(f"Rebuilding sidecar for {month}:", e)
+        return None
+    if "Event Name" in df.columns and not isinstance(df["Event Name"].dtype, pd.CategoricalDtype):
+        return None
+    return df
+
+# Returns the typed frame for a month, or None when the month has no file.
+# Reads come from the sidecar when it is fresh, otherwise the CSV is parsed
+# and the sidecar is rebuilt for the next request.
+def load_month(month):
+    if month_source(month) is None:
+        return None
+
+    df = _read_sidecar(month)
+    if df is not None:
+        return df
+
+    with file_lock(month_csv_path(month), shared=True):
+        return _rebuild_sidecar(month)
+
+# Stands in for the contents of a month (or of all months when month is None)
+# in HTTP cache validators: (version string, mtime), or None when there is no such data.
+# Only stats the files, so checking it costs nothing next to reading the month.
+def data_version(month=None):
+    if month is None:
+        paths = [EVENT_FOLDER, EVENT_ARCHIVE_FOLDER]
+    elif month.isdigit():
+        paths = [month_source(month)]
+    else:
+        return None
+    stats = [stat for stat in map(_stat, paths) if stat]
+    if not stats:
+        return None
+    version = "-".join(f"{stat.st_mtime_ns:x}-{stat.st_size:x}" for stat in stats)
+    return version, max(stat.st_mtime for stat in stats)
+
+# Rewrites a month CSV with every value stripped (see the normalise-data command),
+# then rebuilds its sidecar and index. Returns False when the file was already clean.
+# Archived months are left as they are.
+def normalise_month(month):
+    csv_path = month_csv_path(month)
+    if not os.path.exists(csv_path):
+        return False
+    with file_lock(csv_path):
+        try:
+            df = pd.read_csv(csv_path, encoding=CSV_ENCODING, dtype=str, keep_default_na=False)
+        except pd.errors.EmptyDataError:
+            return False
+        normalised = normalise_frame(df)
+        if normalised.equals(df):
+            return False
+        atomic_write_csv(normalised, csv_path)
+        _rebuild_index(month)
+        return True
+
+# Called by append_rows (which holds the month's lock) after new rows were appended.
+# If the sidecar was up to date before the append, the new rows are added to it
+# directly, otherwise it is rebuilt from the CSV.
+def extend_sidecar(month, rows, was_fresh):
+    if not HAS_ARROW:
+        return
+    if was_fresh:
+        existing = _read_feather(sidecar_path(month))
+        new_rows = to_typed_frame(pd.DataFrame(rows, columns=list(existing.columns)).fillna(""))
+        write_sidecar(month, concat_frames([existing, new_rows]))
+    else:
+        _rebuild_sidecar(month)
+
+# ──────────────────────────────────────
+# 🗄️ Yearly Archives
+# ──────────────────────────────────────
+
+# Closed months don't stay loose CSVs forever: the compact-events command (see
+# event_archive.py) rolls them into one zip per year, data/events/archive/YYYY.zip,
+# with a YYYYMM.csv member per month. Every member is compressed on its own and the
+# zip's central directory records where each one starts, so reading one month only
+# inflates that month, not the whole year.
+#
+# A month is read from its loose CSV when there is one, and from its archive otherwise.
+# Saving an event in an archived month first copies the month back out to a loose CSV
+# (see append_rows), which takes precedence until the month is compacted again.
+
+def archive_path(year):
+    return os.path.join(EVENT_ARCHIVE_FOLDER, f"{year}.zip")
+
+def archive_member(month):
+    return f"{month}.csv"
+
+# The months kept in one archive. An archive that can't be read is reported and skipped.
+def _archived_months(path):
+    try:
+        with zipfile.ZipFile(path) as archive:
+            names = archive.namelist()
+    except (OSError, zipfile.BadZipFile) as e:
+        print(f"Skipping event archive {path}:", e)
+        return []
+    return [name.removesuffix(".csv") for name in names
+            if name.endswith(".csv") and name.removesuffix(".csv").isdigit()]
+
+# The file a month is read from: its loose CSV, the archive holding it, or None when the month has no data.
+def month_source(month):
+    csv_path = month_csv_path(month)
+    if os.path.exists(csv_path):
+        return csv_path
+    return month_catalogue().get(month)
+
+def is_archived(month):
+    source = month_source(month)
+    return source is not None and source != month_csv_path(month)
+
+# Opens a month's CSV for reading as bytes, wherever it is kept.
+@contextmanager
+def open_month(month):
+    source = month_source(month)
+    if source is None or source == month_csv_path(month):
+        with open(month_csv_path(month), "rb") as f:
+            yield f
+    else:
+        with zipfile.ZipFile(source) as archive, archive.open(archive_member(month)) as f:
+            yield f
+
+# Copies an archived month back out to a loose CSV, so rows can be appended to it.
+# The caller holds the month's lock.
+def _restore_month(month):
+    source = month_catalogue().get(month)
+    if source is None:
+        return
+    with zipfile.ZipFile(source) as archive:
+        data = archive.read(archive_member(month))
+    atomic_write_bytes(month_csv_path(month), data)
+    invalidate_catalogue()
+
+# ──────────────────────────────────────
+# 📚 Month Catalogue
+# ──────────────────────────────────────
+
+# The month dropdowns used to list the event folder on every page load. The catalogue
+# of months, and where each one is kept, is now built once and kept in memory. It is
+# built again when the event folder or the archive folder changed, which takes two
+# stats to notice, so months added or compacted by another worker still show up.
+# Writes in this process drop it right away (see invalidate_catalogue).
+#
+# Only a change to the archive folder opens the archives again. The sidecar and index
+# of a month are written into the event folder, so reading an archived month for the
+# first time changes its mtime too, but that only takes listing the loose CSVs again.
+
+# (folder stamp, {month: archive path, or None for a loose CSV})
+_catalogue = (None, {})
+# (archive folder stamp, {month: archive path})
+_archive_catalogue = (None, {})
+
+def _catalogue_stamp():
+    return _mtime(EVENT_FOLDER), _mtime(EVENT_ARCHIVE_FOLDER)
+
+def invalidate_catalogue():
+    global _catalogue, _archive_catalogue
+    _catalogue = (None, {})
+    _archive_catalogue = (None, {})
+
+def _list_folder(folder, suffix):
+    try:
+        files = os.listdir(folder)
+    except FileNotFoundError:
+        return []
+    return sorted(f for f in files if f.endswith(suffix))
+
+# Every archived month and the archive holding it.
+def _archive_months():
+    global _archive_catalogue
+    stamp = _mtime(EVENT_ARCHIVE_FOLDER)
+    cached_stamp, months = _archive_catalogue
+    if stamp == cached_stamp:
+        return months
+
+    months = {}
+    for name in _list_folder(EVENT_ARCHIVE_FOLDER, ".zip"):
+        path = os.path.join(EVENT_ARCHIVE_FOLDER, name)
+        months.update((month, path) for month in _archived_months(path))
+    _archive_catalogue = (stamp, months)
+    return months
+
+# Every month with data and where it is kept. A loose CSV wins over an archived copy.
+def month_catalogue():
+    global _catalogue
+    stamp = _catalogue_stamp()
+    cached_stamp, months = _catalogue
+    if stamp == cached_stamp:
+        return months
+
+    months = dict(_archive_months())
+    for name in _list_folder(EVENT_FOLDER, ".csv"):
+        month = name.removesuffix(".csv")
+        if month.isdigit():
+            months[month] = None
+
+    # The stamp is taken before listing, so a change made while listing is picked up next time
+    _catalogue = (stamp, months)
+    return months
+
+# The months that have event data, loose or archived, oldest first.
+def list_months():
+    return sorted(month_catalogue())
+
+# ──────────────────────────────────────
+# 🗂️ Monthly Event Index
+# ──────────────────────────────────────
+
+# Next to each month we also keep data/events/YYYYMM.index.json, which maps every
+# event_id to its name, date and the row offsets of the employees assigned to it.
+# The index records the size and mtime of the CSV (or archive) it describes, so a file
+# that was changed outside the app is simply re-indexed on the next read.
+#
+# The index also keeps the running totals of the month: the amount payable of the
+# whole month, of every event and of every employee. They are updated with each
+# save, so summaries and report totals never have to add up the rows again.
+# Amounts are kept in cents, so adding rows one save at a time can't drift.
+
+# Bumped whenever the index format changes, older indexes are rebuilt on the next read
+INDEX_VERSION = 2
+
+def index_path(month):
+    return os.path.join(EVENT_FOLDER, f"{month}.index.json")
+
+def _source_signature(month):
+    stat = _stat(month_source(month))
+    return [stat.st_mtime_ns, stat.st_size] if stat else None
+
+def _read_index(month):
+    try:
+        with open(index_path(month), encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+def _write_index(month, index):
+    atomic_write_bytes(index_path(month), json.dumps(index).encode("utf-8"))
+
+def index_is_fresh(month):
+    index = _read_index(month)
+    return (index is not None and index.get("version") == INDEX_VERSION
+            and index.get("csv") == _source_signature(month))
+
+# An amount as whole cents. Amounts that can't be parsed count as nothing, as they do in the reports.
+def to_cents(amount):
+    cents = parse_cents(amount)
+    return 0 if cents is None else cents
+
+# Builds the index from a typed month frame, using groupby so no Python loop runs per row.
+def build_index(df):
+    events, employees, total = {}, {}, 0
+    if not df.empty:
+        cents = amount_cents(df)
+        total = int(cents.sum())
+
+        dates = df["Date"].dt.strftime("%Y-%m-%d")
+        by_event = cents.groupby([df["Event Name"], dates], observed=True)
+        event_totals = by_event.sum()
+        for (name, date), offsets in by_event.indices.items():
+            events[encode_event_id(date, name)] = {
+                "name": name,
+                "date": date,
+                "rows": offsets.tolist(),
+                "total_cents": int(event_totals[(name, date)])
+            }
+
+        # Name and surname as they were on the employee's latest row
+        by_employee = df.assign(cents=cents).groupby("Employee ID", sort=False, observed=True)
+        employee_totals = by_employee.agg(
+            name=("Name", "last"), surname=("Surname", "last"),
+            total_cents=("cents", "sum"), count=("cents", "size"))
+        for id_number, row in employee_totals.iterrows():
+            employees[id_number] = {
+                "name": row["name"],
+                "surname": row["surname"],
+                "total_cents": int(row["total_cents"]),
+                "count": int(row["count"])
+            }
+    return {"version": INDEX_VERSION, "rows": len(df), "total_cents": total,
+            "events": events, "employees": employees}
+
+# Re-indexes the month from its frame. The caller holds the month's file lock.
+def _rebuild_index(month):
+    df = _read_sidecar(month)
+    if df is None:
+        df = _rebuild_sidecar(month)
+    index = build_index(df)
+    index["csv"] = _source_signature(month)
+    _write_index(month, index)
+    return index
+
+# Returns the index for a month, rebuilding it when the CSV changed. None when the month has no file.
+def load_index(month):
+    index = _read_index(month)
+    signature = _source_signature(month)
+    if signature is None:
+        return None
+    if index is not None and index.get("version") == INDEX_VERSION and index.get("csv") == signature:
+        return index
+
+    with file_lock(month_csv_path(month), shared=True):
+        return _rebuild_index(month)
+
+# Called by append_rows (which holds the month's lock) after new rows were appended.
+# The new rows take the offsets after the last indexed row.
+def extend_index(month, rows, was_fresh):
+    if not was_fresh:
+        _rebuild_index(month)
+        return
+
+    index = _read_index(month)
+    for offset, row in enumerate(rows, start=index["rows"]):
+        name, date = str(row["Event Name"]).strip(), str(row["Date"]).strip()
+        cents = to_cents(row.get("Amount Payable"))
+
+        entry = index["events"].setdefault(
+            encode_event_id(date, name), {"name": name, "date": date, "rows": [], "total_cents": 0})
+        entry["rows"].append(offset)
+        entry["total_cents"] += cents
+
+        id_number = str(row.get("Employee ID", "")).strip()
+        employee = index["employees"].setdefault(id_number, {"total_cents": 0, "count": 0})
+        employee.update(name=str(row.get("Name", "")).strip(), surname=str(row.get("Surname", "")).strip())
+        employee["total_cents"] += cents
+        employee["count"] += 1
+
+        index["total_cents"] += cents
+    index["rows"] += len(rows)
+    index["csv"] = _source_signature(month)
+    _write_index(month, index)
+
+# Events in a month, newest first.
+def list_events(month):
+    index = load_index(month)
+    if index is None:
+        return []
+    events = sorted(index["events"].items(), key=lambda item: item[1]["name"])
+    events.sort(key=lambda item: item[1]["date"], reverse=True)
+    return [{"name": e["name"], "date": e["date"], "id": event_id} for event_id, e in events]
+
+# The month rows of one event, looked up by event_id. None when the month has no file.
+def event_rows(month, event_id):
+    index = load_index(month)
+    if index is None:
+        return None
+    entry = index["events"].get(event_id)
+    df = load_month(month)
+    return df.iloc[entry["rows"] if entry else []]
+
+# The month's totals straight from the index: the whole month, per employee
+# (by surname and name) and per event (by date and name). None when the month has no file.
+def month_summary(month):
+    index = load_index(month)
+    if index is None:
+        return None
+    employees = [
+        {"id": id_number, "surname": e["surname"], "name": e["name"],
+         "total": e["total_cents"] / 100, "count": e["count"]}
+        for id_number, e in index["employees"].items()
+    ]
+    events = [
+        {"id": event_id, "name": e["name"], "date": e["date"],
+         "total": e["total_cents"] / 100, "count": len(e["rows"])}
+        for event_id, e in index["events"].items()
+    ]
+    return {
+        "month": month,
+        "rows": index["rows"],
+        "total": index["total_cents"] / 100,
+        "by_employee": sorted(employees, key=lambda e: (e["surname"], e["name"], e["id"])),
+        "by_event": sorted(events, key=lambda e: (e["date"], e["name"]))
+    }
+
+# ──────────────────────────────────────
+# ✍️ Appending Event Rows
+# ──────────────────────────────────────
+
+# Reads only the header line, so appends keep the column order of an existing file.
+def read_event_header(filename):
+    with open(filename, newline="", encoding=CSV_ENCODING) as f:
+        return next(csv.reader(f), None) or EVENT_COLUMNS
+
+# Checks the last byte of a file without reading the rest of it.
+def ends_with_newline(filename):
+    with open(filename, "rb") as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b"\n"
+
+# Appends rows to the month CSV, without reading and rewriting the whole month,
+# then brings the sidecar and the event index up to date. An archived month is
+# copied back out to a loose CSV first.
+def append_rows(month, rows):
+    # Ensure the event folder exists
+    os.makedirs(EVENT_FOLDER, exist_ok=True)
+    filename = month_csv_path(month)
+
+    # The whole append, plus the sidecar and index updates, happens under the month's lock,
+    # so two workers saving events at the same time cannot interleave their rows.
+    with file_lock(filename):
+        if not os.path.exists(filename):
+            _restore_month(month)
+
+        # The header is only written when the file is created (or is still empty)
+        is_new = not os.path.exists(filename) or os.path.getsize(filename) == 0
+        columns = EVENT_COLUMNS if is_new else read_event_header(filename)
+
+        # Whether the columnar sidecar and the event index can be extended in place after the append
+        was_fresh = sidecar_is_fresh(month)
+        index_was_fresh = index_is_fresh(month)
+
+        # Guard against a hand-edited file that lost its trailing newline
+        needs_newline = not is_new and not ends_with_newline(filename)
+
+        with open(filename, "a", newline="", encoding=CSV_ENCODING) as f:
+            if needs_newline:
+                f.write("\n")
+            writer = csv.DictWriter(f, fieldnames=columns, extrasaction="ignore", lineterminator="\n")
+            if is_new:
+                writer.writeheader()
+            writer.writerows(rows)
+
+            # One fsync per batch of rows
+            f.flush()
+            os.fsync(f.fileno())
+
+        extend_sidecar(month, rows, was_fresh)
+        extend_index(month, rows, index_was_fresh)
+
+    if is_new:
+        invalidate_catalogue()
@@ -0,0 +1,119 @@
+import functools
+import zlib
+from datetime import datetime, timezone
+from flask import request, make_response, Response
+from config import COMPRESS_MIN_BYTES, GZIP_LEVEL, BROTLI_QUALITY
+from lazy_imports import lazy_import, is_available
+
+# brotli is optional, gzip is always there.
+HAS_BROTLI = is_available("brotli")
+brotli = lazy_import("brotli")
+
+# ──────────────────────────────────────
+# 🔁 Conditional Requests
+# ──────────────────────────────────────
+
+# The report and form pages fetch the month and event lists again every time a
+# dropdown changes. Those JSON routes send an ETag and a Last-Modified taken from
+# the data they are built from (see data_version in storage.py), and a request
+# that already has the current version gets a 304 before the route reads any file.
+#
+# The responses are sent with "no-cache", so the browser keeps them but always
+# asks first. The ETags are weak, so they still match once a response is compressed.
+
+# Wraps a route whose response only depends on the data version_of returns for the
+# route's arguments: (version string, mtime), or None when there is nothing to cache.
+def conditional(version_of):
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(**kwargs):
+            version = version_of(**kwargs)
+            if version is None:
+                return view(**kwargs)
+
+            etag, mtime = version
+            last_modified = datetime.fromtimestamp(int(mtime), timezone.utc)
+            if request.if_none_match:
+                unchanged = request.if_none_match.contains_weak(etag)
+            else:
+                unchanged = request.if_modified_since is not None and request.if_modified_since >= last_modified
+
+            response = Response(status=304) if unchanged else make_response(view(**kwargs))
+            # Error answers are never kept
+            if response.status_code in (200, 304):
+                response.set_etag(etag, weak=True)
+                response.last_modified = last_modified
+                response.cache_control.no_cache = True
+            return response
+        return wrapper
+    return decorator
+
+# ──────────────────────────────────────
+# 🗜️ Response Compression
+# ──────────────────────────────────────
+
+# Month dumps are mostly the same names and event titles over and over, and
+# compress to a fraction of their size. Text responses of at least
+# COMPRESS_MIN_BYTES are compressed after the route has run. Streamed reports
+# are compressed a chunk at a time, so rows still reach the browser as they are
+# serialised. PDFs, zips and images are already compressed and are left alone.
+
+COMPRESSIBLE = {
+    "application/json", "application/x-ndjson", "application/javascript",
+    "text/html", "text/css", "text/javascript", "text/plain", "image/svg+xml"
+}
+
+ENCODINGS = ["br", "gzip"] if HAS_BROTLI else ["gzip"]
+
+# Compresses the chunks, flushing after each one so a streamed chunk is sent right away.
+def compress_chunks(encoding, chunks):
+    if encoding == "br":
+        compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+        for chunk in chunks:
+            data = compressor.process(chunk) + compressor.flush()
+            if data:
+                yield data
+        yield compressor.finish()
+    else:
+        # wbits=31 writes the gzip header and trailer
+        compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+        for chunk in chunks:
+            data = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+            if data:
+                yield data
+        yield compressor.flush()
+
+def _compress_response(response):
+    if (response.status_code != 200 or request.method == "HEAD"
+            or response.mimetype not in COMPRESSIBLE or "Content-Encoding" in response.headers):
+        return response
+    response.vary.add("Accept-Encoding")
+
+    encoding = request.accept_encodings.best_match(ENCODINGS)
+    if encoding is None:
+        return response
+
+    # Static files are sent straight from the open file, reading them makes them a normal body
+    if response.direct_passthrough:
+        response.direct_passthrough = False
+        response.make_sequence()
+
+    if response.is_streamed:
+        response.response = compress_chunks(encoding, response.iter_encoded())
+        response.headers.pop("Content-Length", None)
+    else:
+        data = response.get_data()
+        if len(data) < COMPRESS_MIN_BYTES:
+            return response
+        response.set_data(b"".join(compress_chunks(encoding, [data])))
+
+    response.headers["Content-Encoding"] = encoding
+    # The compressed body no longer matches byte ranges or a strong ETag of the file
+    response.headers.pop("Accept-Ranges", None)
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
+
+def init_app(app):
+    app.after_request(_compress_response)
@@ -0,0 +1,200 @@
+import cProfile
+import os
+import threading
+import time
+from contextlib import contextmanager
+from flask import g, has_request_context, request, before_render_template, template_rendered
+from config import PROFILE_SLOW_MS, PROFILE_DIR, PROFILER
+
+# pyinstrument is optional, cProfile is always there.
+try:
+    from pyinstrument import Profiler as PyinstrumentProfiler
+except ImportError:
+    PyinstrumentProfiler = None
+
+# ──────────────────────────────────────
+# ⏱️ Request + Stage Timings
+# ──────────────────────────────────────
+
+# Every request is timed, and so are the expensive stages inside it: parsing CSVs,
+# sorting, Jinja rendering and WeasyPrint layout. The stages of a request are sent
+# back in a Server-Timing header (the browser dev tools show them next to the
+# request), and all timings are collected for the /metrics endpoint.
+#
+# The numbers are kept per process. With several gunicorn workers each one
+# reports its own, the way Prometheus expects from a multi-process app.
+
+# Histogram buckets, in seconds
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+_lock = threading.Lock()
+_request_durations = {}   # (route, method) → [bucket counts, sum, count]
+_request_counts = {}      # (route, method, status) → count
+_stage_durations = {}     # stage → [bucket counts, sum, count]
+
+def _observe(histograms, key, seconds):
+    with _lock:
+        entry = histograms.setdefault(key, [[0] * len(BUCKETS), 0.0, 0])
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                entry[0][i] += 1
+        entry[1] += seconds
+        entry[2] += 1
+
+# Times the block as one stage. Inside a request the stage is also added to the
+# request's Server-Timing header. Works outside requests too (e.g. in PDF job workers).
+@contextmanager
+def span(stage):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - start
+        _observe(_stage_durations, stage, seconds)
+        if has_request_context() and "timing_spans" in g:
+            g.timing_spans[stage] = g.timing_spans.get(stage, 0.0) + seconds
+
+# ──────────────────────────────────────
+# 🪝 Flask Hooks
+# ──────────────────────────────────────
+
+def _start_request():
+    g.timing_start = time.perf_counter()
+    g.timing_spans = {}
+    g.profiler = _start_profiler() if PROFILE_SLOW_MS is not None else None
+
+def _finish_request(response):
+    if "timing_start" not in g:
+        return response
+    seconds = time.perf_counter() - g.timing_start
+    route = request.url_rule.rule if request.url_rule else "unmatched"
+
+    _observe(_request_durations, (route, request.method), seconds)
+    with _lock:
+        key = (route, request.method, response.status_code)
+        _request_counts[key] = _request_counts.get(key, 0) + 1
+
+    timings = [f"{stage};dur={spent * 1000:.1f}" for stage, spent in g.timing_spans.items()]
+    timings.append(f"total;dur={seconds * 1000:.1f}")
+    response.headers["Server-Timing"] = ", ".join(timings)
+
+    if g.profiler is not None:
+        _stop_profiler(g.profiler, seconds)
+        g.profiler = None
+    return response
+
+# A request that raised never reaches after_request, so its profiler is switched off here.
+def _teardown_request(error):
+    profiler = g.pop("profiler", None)
+    if profiler is None:
+        return
+    if isinstance(profiler, cProfile.Profile):
+        profiler.disable()
+    else:
+        profiler.stop()
+
+# render_template doesn't take a callback, so its timing comes from Flask's template signals.
+def _template_started(sender, template, context, **extra):
+    g.setdefault("template_starts", []).append(time.perf_counter())
+
+def _template_finished(sender, template, context, **extra):
+    starts = g.get("template_starts")
+    if not starts:
+        return
+    seconds = time.perf_counter() - starts.pop()
+    _observe(_stage_durations, "render_template", seconds)
+    if "timing_spans" in g:
+        g.timing_spans["render_template"] = g.timing_spans.get("render_template", 0.0) + seconds
+
+def init_app(app):
+    app.before_request(_start_request)
+    app.after_request(_finish_request)
+    app.teardown_request(_teardown_request)
+    before_render_template.connect(_template_started, app)
+    template_rendered.connect(_template_finished, app)
+
+# ──────────────────────────────────────
+# 🐢 Slow Request Profiles
+# ──────────────────────────────────────
+
+# With PROFILE_SLOW_MS set, every request runs under a profiler, and the profile of
+# any request slower than the threshold is written to PROFILE_DIR:
+#   cProfile     → .prof files, open with `python -m pstats` or snakeviz
+#   pyinstrument → .html files, open in a browser
+
+def _start_profiler():
+    if PROFILER == "pyinstrument" and PyinstrumentProfiler is not None:
+        profiler = PyinstrumentProfiler()
+    else:
+        profiler = cProfile.Profile()
+    try:
+        if isinstance(profiler, cProfile.Profile):
+            profiler.enable()
+        else:
+            profiler.start()
+    except (RuntimeError, ValueError):
+        # Another profiler is already running in this thread
+        return None
+    return profiler
+
+def _stop_profiler(profiler, seconds):
+    is_cprofile = isinstance(profiler, cProfile.Profile)
+    if is_cprofile:
+        profiler.disable()
+    else:
+        profiler.stop()
+    if seconds * 1000 < PROFILE_SLOW_MS:
+        return
+
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    endpoint = (request.endpoint or "unmatched").replace(".", "_")
+    path = os.path.join(PROFILE_DIR, f"{time.strftime('%Y%m%d-%H%M%S')}_{endpoint}_{seconds * 1000:.0f}ms")
+    if is_cprofile:
+        profiler.dump_stats(f"{path}.prof")
+    else:
+        with open(f"{path}.html", "w", encoding="utf-8") as f:
+            f.write(profiler.output_html())
+
+# ──────────────────────────────────────
+# 📈 Prometheus Metrics
+# ──────────────────────────────────────
+
+def _label_value(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _labels(**labels):
+    return ",".join(f'{name}="{_label_value(value)}"' for name, value in labels.items())
+
+def _histogram_lines(name, histograms, label_names):
+    lines = []
+    for key, (buckets, total, count) in sorted(histograms.items()):
+        labels = _labels(**dict(zip(label_names, key if isinstance(key, tuple) else (key,))))
+        for bound, bucket_count in zip(BUCKETS, buckets):
+            lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {bucket_count}')
+        lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {count}')
+        lines.append(f"{name}_sum{{{labels}}} {total:.6f}")
+        lines.append(f"{name}_count{{{labels}}} {count}")
+    return lines
+
+# All metrics in the Prometheus text format.
+def render_metrics():
+    with _lock:
+        lines = [
+            "# HELP form_easy_requests_total Requests handled, by route, method and status.",
+            "# TYPE form_easy_requests_total counter"
+        ]
+        for (route, method, status), count in sorted(_request_counts.items()):
+            lines.append(f"form_easy_requests_total{{{_labels(route=route, method=method, status=status)}}} {count}")
+
+        lines += [
+            "# HELP form_easy_request_duration_seconds Time spent handling a request, by route and method.",
+            "# TYPE form_easy_request_duration_seconds histogram"
+        ]
+        lines += _histogram_lines("form_easy_request_duration_seconds", _request_durations, ["route", "method"])
+
+        lines += [
+            "# HELP form_easy_stage_duration_seconds Time spent in one stage (CSV parsing, sorting, templates, PDF layout).",
+            "# TYPE form_easy_stage_duration_seconds histogram"
+        ]
+        lines += _histogram_lines("form_easy_stage_duration_seconds", _stage_durations, ["stage"])
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,62 @@
+import importlib
+import importlib.util
+import sys
+import threading
+
+# ──────────────────────────────────────
+# 💤 Lazy Imports
+# ──────────────────────────────────────
+
+# WeasyPrint (with its pango/cairo bindings), pandas, pyarrow and PyPDF2 take
+# most of the time it takes to start a worker, but pages like the home page,
+# the report pickers and the forms dashboard never touch them. Modules that use
+# them import them through lazy_import, and the real import happens on the first
+# attribute access, e.g. the first pd.read_csv(...).
+#
+# Set PRELOAD_HEAVY_MODULES in config.py (or call preload() from a gunicorn hook)
+# to import everything up front instead, e.g. with gunicorn --preload, so the
+# forked workers share the already imported modules.
+
+_registry = []
+
+# Stands in for a module until one of its attributes is used.
+class LazyModule:
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+        self._lock = threading.Lock()
+
+    def load(self):
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attr):
+        return getattr(self.load(), attr)
+
+    def __repr__(self):
+        state = "loaded" if self._module is not None else "not loaded yet"
+        return f"<lazy module {self._name!r} ({state})>"
+
+def lazy_import(name):
+    module = LazyModule(name)
+    _registry.append(module)
+    return module
+
+# Whether a module has really been imported (by anyone) yet.
+def is_loaded(name):
+    return name in sys.modules
+
+# Whether a module could be imported, without importing it.
+def is_available(name):
+    try:
+        return importlib.util.find_spec(name) is not None
+    except ModuleNotFoundError:
+        return False
+
+# Imports every module registered with lazy_import now.
+def preload():
+    for module in _registry:
+        module.load()
@@ -0,0 +1,100 @@
+import hashlib
+import json
+import os
+import tempfile
+from lazy_imports import lazy_import, is_loaded
+from config import PDF_CACHE_DIR, PDF_CACHE_MAX_BYTES
+from template_env import loaded_source
+
+pd = lazy_import("pandas")
+
+# ──────────────────────────────────────
+# 🗄️ Rendered PDF Cache
+# ──────────────────────────────────────
+
+# WeasyPrint is by far the slowest part of the app, so rendered PDFs are kept on disk.
+# The key is a hash of everything that goes into a document: the input rows,
+# the template source as it was loaded (see template_env.py) and the employer info. If any of them change, the key changes
+# and the stale entry simply ages out of the cache.
+
+# Hashes rows from either a DataFrame or a list of dicts.
+# (A DataFrame can only exist once pandas is loaded, so a list of dicts never imports it.)
+def hash_rows(rows):
+    digest = hashlib.sha256()
+    if is_loaded("pandas") and isinstance(rows, pd.DataFrame):
+        digest.update(json.dumps(list(rows.columns)).encode())
+        digest.update(pd.util.hash_pandas_object(rows, index=False).values.tobytes())
+    else:
+        digest.update(json.dumps(rows, sort_keys=True, default=str).encode())
+    return digest.hexdigest()
+
+# Builds the cache key for a document.
+# extra covers any other template variable that changes the output, like a report title.
+def make_key(rows, templates, employer, extra=None):
+    digest = hashlib.sha256()
+    digest.update(hash_rows(rows).encode())
+    for name in templates:
+        digest.update(name.encode())
+        digest.update(loaded_source(name))
+    digest.update(json.dumps(employer, sort_keys=True).encode())
+    if extra is not None:
+        digest.update(json.dumps(extra, sort_keys=True, default=str).encode())
+    return digest.hexdigest()
+
+def _path(key):
+    return os.path.join(PDF_CACHE_DIR, f"{key}.pdf")
+
+# Returns the cached PDF bytes, or None on a miss.
+# A hit bumps the file's mtime, which is what the LRU eviction sorts on.
+def load(key):
+    path = _path(key)
+    try:
+        with open(path, "rb") as f:
+            pdf = f.read()
+    except FileNotFoundError:
+        return None
+    try:
+        os.utime(path)
+    except FileNotFoundError:
+        pass
+    return pdf
+
+# Writes a rendered PDF to the cache, then trims the cache back under its size limit.
+# The temp file + os.replace means a reader never sees a half-written PDF.
+def store(key, pdf):
+    os.makedirs(PDF_CACHE_DIR, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=PDF_CACHE_DIR, suffix=".tmp")
+    with os.fdopen(fd, "wb") as f:
+        f.write(pdf)
+    os.replace(tmp_path, _path(key))
+    evict()
+
+# Least recently used entries are removed first, until the cache fits in PDF_CACHE_MAX_BYTES.
+def evict(max_bytes=PDF_CACHE_MAX_BYTES):
+    entries = []
+    with os.scandir(PDF_CACHE_DIR) as it:
+        for entry in it:
+            if entry.name.endswith(".pdf"):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        total -= size
+
+# Returns the cached PDF for a key, rendering and storing it on a miss.
+def get_or_render(key, render):
+    pdf = load(key)
+    if pdf is None:
+        pdf = render()
+        store(key, pdf)
+    return pdf
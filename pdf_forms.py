@@ -0,0 +1,129 @@
+import functools
+import io
+import zipfile
+
+# for PDF generation, copilot helped me understand how to use WeasyPrint
+# and Jinja2 for rendering HTML templates to PDF.
+# WeasyPrint is only imported when the first PDF is rendered, see lazy_imports.py.
+from lazy_imports import lazy_import
+
+from instrumentation import span
+from render_pool import render_map
+from template_env import env, stylesheet_source
+from utils import merge_pdfs
+
+weasyprint = lazy_import("weasyprint")
+weasyprint_fonts = lazy_import("weasyprint.text.fonts")
+
+# ──────────────────────────────────────
+# 🧠 Jinja2 Setup (for multipage PDF rendering)
+# ──────────────────────────────────────
+# The environment is shared with the report PDFs, see template_env.py.
+
+# List of form templates to render, in the order they appear in the pack.
+FORM_TEMPLATES = [
+    "forms/employment_agreement.html",
+    "forms/wage_claim.html",
+    "forms/payment_acknowledgment.html"
+]
+
+# The wrapper document and stylesheet the forms are laid out with.
+PACK_TEMPLATE = "forms/pack.html"
+PACK_STYLESHEET = "forms/forms.css"
+
+# Every source file that ends up in a pack, used for the PDF cache key.
+PACK_SOURCES = [PACK_TEMPLATE, PACK_STYLESHEET] + FORM_TEMPLATES
+
+# ──────────────────────────────────────
+# 🎨 Shared Stylesheet + Fonts
+# ──────────────────────────────────────
+# Parsing CSS and resolving fonts is a big part of every render,
+# so both are done once per process (on the first render) and reused for every pack.
+# The stylesheet comes from template_env, the same source the PDF cache key is taken from.
+# Returns (font configuration, parsed stylesheet).
+def pack_style():
+    return _parse_style(stylesheet_source(PACK_STYLESHEET))
+
+@functools.cache
+def _parse_style(source):
+    font_config = weasyprint_fonts.FontConfiguration()
+    stylesheet = weasyprint.CSS(string=source.decode("utf-8"), base_url=f"templates/{PACK_STYLESHEET}",
+                                font_config=font_config)
+    return font_config, stylesheet
+
+# ──────────────────────────────────────
+# 🧾 Employee Form Pack
+# ──────────────────────────────────────
+
+# Builds the event dict the form templates expect from a row of a monthly event file.
+def event_from_row(row):
+    return {
+        "Name": row["Event Name"],
+        "Date": row["Date"],
+        "AmountPayable": f"{float(row['Amount Payable']):.2f}"
+    }
+
+# The download name used for a single employee's pack.
+def pack_filename(employee, event):
+    return f"{employee['Surname']}_{employee['Name']}_{event['Date'].replace('-', '')}.pdf"
+
+# Renders the three forms for one employee and returns the PDF bytes.
+# All forms go into one HTML document, so WeasyPrint lays out the pack in a single pass.
+def render_employee_pack(employee, event, employer):
+    with span("jinja"):
+        html = env.get_template(PACK_TEMPLATE).render(
+            form_templates=FORM_TEMPLATES, employee=employee, event=event, employer=employer)
+    font_config, stylesheet = pack_style()
+    with span("weasyprint"):
+        return weasyprint.HTML(string=html).write_pdf(stylesheets=[stylesheet], font_config=font_config)
+
+# Process pool entry point, it has to live at module level so it can be pickled.
+def _render_pack_job(job):
+    employee, event, employer = job
+    return pack_filename(employee, event), render_employee_pack(employee, event, employer)
+
+# Renders a pack for every (employee, event, employer) job.
+# Jobs go to the shared render pool (see render_pool.py), since WeasyPrint layout is single-threaded.
+# Yields (filename, pdf) in the same order as the jobs, as soon as each pack is ready.
+def render_packs(jobs, serial=False):
+    return render_map(_render_pack_job, jobs, serial=serial)
+
+# ──────────────────────────────────────
+# 📦 Bundling
+# ──────────────────────────────────────
+
+# Write-only file object that hands out what was written since the last take().
+# zipfile sees it can't seek, so it writes every entry's sizes after its data
+# and never goes back to patch an earlier header.
+class _ZipSink(io.RawIOBase):
+    def __init__(self):
+        self.chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def take(self):
+        data = b"".join(self.chunks)
+        self.chunks = []
+        return data
+
+# Packs every rendered PDF into one ZIP archive, yielding the archive in pieces.
+# Each entry is sent as soon as its pack is rendered, so only one pack is held in memory.
+def stream_zip(packs):
+    sink = _ZipSink()
+    with zipfile.ZipFile(sink, "w", zipfile.ZIP_DEFLATED) as archive:
+        for filename, pdf in packs:
+            archive.writestr(filename, pdf)
+            yield sink.take()
+    yield sink.take()
+
+# Merges every rendered PDF into one document.
+def bundle_pdf(packs):
+    buffer = io.BytesIO()
+    merge_pdfs([io.BytesIO(pdf) for _, pdf in packs], buffer)
+    buffer.seek(0)
+    return buffer
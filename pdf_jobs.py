@@ -0,0 +1,143 @@
+import json
+import os
+import re
+import shutil
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+
+import pdf_cache
+from config import PDF_JOB_WORKERS, PDF_JOB_DIR, PDF_JOB_TTL
+from safe_write import atomic_write_bytes
+from report_pdf import (
+    REPORT_EXPORTS, load_export_rows, export_download_name, export_total, report_key, render_report
+)
+
+# ──────────────────────────────────────
+# ⏳ Background Report Export Jobs
+# ──────────────────────────────────────
+
+# A big month can take WeasyPrint long enough to hit the proxy timeout, and the
+# request worker is stuck for the whole render. Report exports are therefore
+# submitted as jobs: they render in a small process pool (PDF_JOB_WORKERS) and
+# the browser polls the job status until the PDF is ready to download.
+#
+# Every job has its own folder under PDF_JOB_DIR with a status.json and, once it
+# is done, a result.pdf. Because the status lives on disk, any app process can
+# answer the status and download requests, not only the one that started the job.
+#
+# States: queued → loading → rendering → done (or failed)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+# Job IDs are uuid4 hex strings, anything else never reaches the file system.
+JOB_ID_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+
+def job_dir(job_id):
+    return os.path.join(PDF_JOB_DIR, job_id)
+
+def _status_path(job_id):
+    return os.path.join(job_dir(job_id), "status.json")
+
+def result_path(job_id):
+    return os.path.join(job_dir(job_id), "result.pdf")
+
+# The pool is only started on the first export, so the app starts as fast as before.
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(max_workers=PDF_JOB_WORKERS)
+        return _executor
+
+# Returns the status dict of a job, or None for an unknown job.
+def read_status(job_id):
+    if not JOB_ID_PATTERN.match(job_id):
+        return None
+    try:
+        with open(_status_path(job_id), encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+# Merges the changes into the job's status.json, which is replaced atomically.
+def _update_status(job_id, **changes):
+    status = read_status(job_id) or {}
+    status.update(changes, updated=time.time())
+    atomic_write_bytes(_status_path(job_id), json.dumps(status).encode("utf-8"))
+    return status
+
+# Copies the finished PDF into the job folder and marks the job as done.
+def _finish(job_id, pdf):
+    atomic_write_bytes(result_path(job_id), pdf)
+    _update_status(job_id, state="done", progress=100)
+
+# Process pool entry point. Loads the rows, renders the report and stores the PDF,
+# updating the job status along the way. Errors are recorded on the job, not raised.
+def _run_job(job_id, kind, filename):
+    try:
+        _update_status(job_id, state="loading", progress=10)
+        df = load_export_rows(kind, filename)
+        if df is None:
+            _update_status(job_id, state="failed", error="File not found")
+            return
+
+        template = REPORT_EXPORTS[kind]["template"]
+        key = report_key(df, template)
+        _update_status(job_id, state="rendering", progress=30, rows=len(df))
+
+        # Another request may have rendered the same report while this job was queued
+        pdf = pdf_cache.load(key)
+        if pdf is None:
+            # The job is already in a worker process, so it doesn't take a second one from the render pool
+            pdf = render_report(df, template, total=export_total(df, filename), serial=True)
+            pdf_cache.store(key, pdf)
+        _finish(job_id, pdf)
+    except Exception as e:
+        _update_status(job_id, state="failed", error=str(e))
+
+# Catches a job whose worker process died before it could record the failure.
+def _check_future(job_id, future):
+    error = future.exception()
+    if error is not None:
+        _update_status(job_id, state="failed", error=str(error))
+
+# Removes the folders of jobs that finished (or were last updated) more than PDF_JOB_TTL ago.
+def cleanup_jobs():
+    try:
+        job_ids = os.listdir(PDF_JOB_DIR)
+    except FileNotFoundError:
+        return
+    cutoff = time.time() - PDF_JOB_TTL
+    for job_id in job_ids:
+        status = read_status(job_id)
+        try:
+            updated = status["updated"] if status else os.path.getmtime(job_dir(job_id))
+        except OSError:
+            continue
+        if updated < cutoff:
+            shutil.rmtree(job_dir(job_id), ignore_errors=True)
+
+# Starts an export of one monthly report and returns its status.
+# kind is one of REPORT_EXPORTS, filename a monthly file such as "202505.csv".
+def submit_export(kind, filename):
+    cleanup_jobs()
+
+    job_id = uuid.uuid4().hex
+    os.makedirs(job_dir(job_id))
+    status = _update_status(
+        job_id,
+        id=job_id,
+        kind=kind,
+        file=filename,
+        download_name=export_download_name(kind, filename),
+        state="queued",
+        progress=0,
+        created=time.time()
+    )
+
+    future = _get_executor().submit(_run_job, job_id, kind, filename)
+    future.add_done_callback(lambda f: _check_future(job_id, f))
+    return status
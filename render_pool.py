@@ -0,0 +1,73 @@
+import resource
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from config import PDF_WORKERS, REPORT_WORKER_MEMORY_MB
+
+# ──────────────────────────────────────
+# 🏭 Shared PDF Render Pool
+# ──────────────────────────────────────
+
+# WeasyPrint layout is single-threaded, so PDFs are rendered in worker processes.
+# The event packs and report PDFs of the app process all go through this one pool
+# of PDF_WORKERS processes. Concurrent requests queue for the same workers instead
+# of each starting a pool of their own, so an app process never renders more than
+# PDF_WORKERS of them at once, and the workers are only started once. Export jobs
+# already run in a worker process of their own (see pdf_jobs.py), they render
+# serially in that process.
+#
+# Like the export job pool (see pdf_jobs.py) it is created on first use, so the
+# app starts as fast as before. A worker that dies breaks the pool; it is then
+# dropped and the next render starts a new one.
+#
+# Every worker may only grow by REPORT_WORKER_MEMORY_MB of address space, so a
+# render that still needs too much fails instead of exhausting the server.
+
+_pool = None
+_pool_lock = threading.Lock()
+
+# The limit is on top of what the worker starts with: a forked worker inherits the
+# address space of the app, and pyarrow alone reserves about a gigabyte of it.
+def _limit_memory():
+    if REPORT_WORKER_MEMORY_MB is None:
+        return
+    try:
+        with open("/proc/self/statm") as f:
+            in_use = int(f.read().split()[0]) * resource.getpagesize()
+    except OSError:
+        # Not Linux, where RLIMIT_AS isn't enforced anyway
+        return
+    _, hard = resource.getrlimit(resource.RLIMIT_AS)
+    limit = in_use + REPORT_WORKER_MEMORY_MB * 1024 * 1024
+    if hard != resource.RLIM_INFINITY:
+        limit = min(limit, hard)
+    resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+
+def _get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=PDF_WORKERS, initializer=_limit_memory)
+        return _pool
+
+def _discard(pool):
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+# Yields fn(job) for every job, in the order of the jobs, as soon as each one is ready.
+# With serial, or PDF_WORKERS set to 1, the jobs run one after another in this process.
+# fn has to live at module level, so it can be pickled.
+def render_map(fn, jobs, serial=False):
+    if serial or PDF_WORKERS <= 1:
+        yield from map(fn, jobs)
+        return
+
+    pool = _get_pool()
+    try:
+        yield from pool.map(fn, jobs)
+    except BrokenProcessPool:
+        _discard(pool)
+        raise
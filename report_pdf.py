@@ -0,0 +1,149 @@
+import io
+
+import pdf_cache
+from config import REPORT_CHUNK_ROWS
+from instrumentation import span
+from lazy_imports import lazy_import
+from render_pool import render_map
+from template_env import env
+from storage import load_month, month_summary
+from event_store import amount_cents
+from utils import get_employer_info, merge_pdfs
+
+weasyprint = lazy_import("weasyprint")
+
+# ──────────────────────────────────────
+# 📊 Report PDF Rendering
+# ──────────────────────────────────────
+
+# Report rendering lives outside the Flask routes, so the same code can run in a
+# request or in a background export job (see pdf_jobs.py). The export branch of the
+# reports/by_*.html templates doesn't use anything from Flask, so they are rendered
+# with the shared environment from template_env.py.
+
+# 🔃 Sort orders for the report views, the same ones the PDF exports use
+REPORT_SORTS = {
+    "date": ["Date"],
+    "employee": ["Surname", "Name", "Date"],
+    "event": ["Event Name", "Date"]
+}
+
+# The three monthly PDF exports: which template they use, how the rows are sorted
+# and the suffix of the downloaded file.
+REPORT_EXPORTS = {
+    "month": {"template": "reports/by_date.html", "sort": "date", "suffix": "_by_date.pdf"},
+    "employee": {"template": "reports/by_employee.html", "sort": "employee", "suffix": "_by_employee.pdf"},
+    "event": {"template": "reports/by_event.html", "sort": "event", "suffix": "_by_event.pdf"}
+}
+
+# The rows of one group (a day, an employee, an event) always end up in the same chunk of a large report.
+# A group is a run of rows with the same leading sort keys (see REPORT_SORTS), the way the
+# template lists them: the employee report orders by name, so employees who share a name
+# are kept together too.
+REPORT_GROUPS = {
+    "reports/by_date.html": ["Date"],
+    "reports/by_employee.html": ["Surname", "Name"],
+    "reports/by_event.html": ["Event Name", "Date"]
+}
+
+# 📂 Load a monthly report file (e.g. "202505.csv") through the event store
+def load_month_file(filename):
+    month = filename.removesuffix(".csv")
+    if not filename.endswith(".csv") or not month.isdigit():
+        return None
+    return load_month(month)
+
+# The rows of a monthly export, sorted the way its template expects. None when the file doesn't exist.
+def load_export_rows(kind, filename):
+    df = load_month_file(filename)
+    if df is None:
+        return None
+    with span("sort"):
+        return df.sort_values(REPORT_SORTS[REPORT_EXPORTS[kind]["sort"]], kind="stable")
+
+def export_download_name(kind, filename):
+    return filename.replace(".csv", REPORT_EXPORTS[kind]["suffix"])
+
+# The PDF cache key of a report, see pdf_cache.make_key.
+def report_key(df, template, period=None):
+    return pdf_cache.make_key(df, [template], get_employer_info(), extra=period)
+
+# The amount payable of a whole monthly report, from the month's running totals.
+# Falls back to adding up the rows when the totals don't describe the same rows.
+def export_total(df, filename):
+    summary = month_summary(filename.removesuffix(".csv"))
+    if summary is None or summary["rows"] != len(df):
+        return int(amount_cents(df).sum()) / 100
+    return summary["total"]
+
+# Renders the rows of a report into PDF bytes. The total is added up from the rows unless it is given.
+# Reports longer than REPORT_CHUNK_ROWS are rendered in chunks, see below.
+# The rendering is done on the shared render pool (see render_pool.py), so a request never
+# lays out a PDF in its own thread. An export job already runs in a worker process of its
+# own and passes serial, it then renders in that process.
+def render_report(df, template, period=None, total=None, serial=False):
+    if total is None:
+        total = int(amount_cents(df).sum()) / 100
+    if len(df) <= REPORT_CHUNK_ROWS:
+        return next(render_map(_render_chunk, [(df, template, period, total)], serial=serial))
+    return _render_chunked(df, template, period, total, serial)
+
+# One PDF of report rows. A chunk after the first starts with the total brought forward
+# from the chunks before it, and a chunk before the last ends with the total carried forward.
+def _render_part(df, template, period, total, brought_forward=None, carried_forward=False):
+    with span("jinja"):
+        rendered = env.get_template(template).render(
+            rows=df.to_dict(orient="records"),
+            total=total,
+            brought_forward=brought_forward,
+            carried_forward=carried_forward,
+            period=period,
+            export_mode=True
+        )
+    with span("weasyprint"):
+        return weasyprint.HTML(string=rendered).write_pdf()
+
+# ──────────────────────────────────────
+# 🧩 Chunked Rendering of Large Reports
+# ──────────────────────────────────────
+
+# WeasyPrint lays out a whole document at once, and its time and memory grow faster
+# than the table does, so one month of tens of thousands of rows can take a worker
+# down. Large reports are therefore cut into chunks of about REPORT_CHUNK_ROWS rows,
+# always between two groups (see REPORT_GROUPS), rendered on the shared render pool
+# (see render_pool.py) and merged into one PDF. The running total is carried from one
+# chunk to the next.
+
+# The row offsets chunks start at. A group larger than a chunk gets a chunk of its own.
+def chunk_starts(df, template):
+    columns = REPORT_GROUPS.get(template, ["Date"])
+    keys = df[columns]
+    group_starts = (keys.ne(keys.shift()).any(axis=1)).to_numpy().nonzero()[0].tolist()
+
+    starts = [0]
+    for start in group_starts[1:]:
+        if start - starts[-1] >= REPORT_CHUNK_ROWS:
+            starts.append(start)
+    return starts
+
+def _render_chunk(job):
+    return _render_part(*job)
+
+def _render_chunked(df, template, period, total, serial):
+    starts = chunk_starts(df, template)
+    ends = starts[1:] + [len(df)]
+    running = amount_cents(df).cumsum() / 100
+
+    jobs = []
+    for start, end in zip(starts, ends):
+        is_last = end == len(df)
+        brought_forward = float(running.iat[start - 1]) if start else None
+        jobs.append((
+            df.iloc[start:end], template, period,
+            total if is_last else float(running.iat[end - 1]),
+            brought_forward, not is_last
+        ))
+
+    buffer = io.BytesIO()
+    merge_pdfs([io.BytesIO(part) for part in render_map(_render_chunk, jobs, serial=serial)], buffer)
+    return buffer.getvalue()
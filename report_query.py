@@ -0,0 +1,94 @@
+from concurrent.futures import ThreadPoolExecutor
+from config import REPORT_QUERY_WORKERS
+from event_store import load_month, list_months, concat_frames, amount_cents, to_typed_frame, EVENT_COLUMNS
+from lazy_imports import lazy_import
+
+pd = lazy_import("pandas")
+
+# ──────────────────────────────────────
+# 🔎 Date-Range Report Queries
+# ──────────────────────────────────────
+
+# Reports used to work on one YYYYMM.csv at a time. These helpers answer a
+# query over any date range instead: only the months that overlap the range
+# are opened, they are read in parallel, and each month is filtered before
+# its rows are combined, so only matching rows are ever built.
+
+# The months with data (loose or archived) that overlap [start, end], oldest first.
+def months_in_range(start, end):
+    first, last = start.strftime("%Y%m"), end.strftime("%Y%m")
+    return [month for month in list_months() if first <= month <= last]
+
+# Loads one month and keeps only the rows that match the filters.
+def _filter_month(month, start, end, employee_id, event_name):
+    df = load_month(month)
+    if df is None or df.empty:
+        return None
+
+    mask = (df["Date"] >= start) & (df["Date"] <= end)
+    if employee_id:
+        mask &= df["Employee ID"] == employee_id
+    if event_name:
+        mask &= df["Event Name"] == event_name
+    return df[mask]
+
+# A typed frame without rows, so the totals and reports work on it like on any other result.
+def empty_frame():
+    return to_typed_frame(pd.DataFrame(columns=EVENT_COLUMNS))
+
+# Returns every matching row between start and end (inclusive), sorted by date.
+def query_events(start, end, employee_id=None, event_name=None):
+    start, end = pd.Timestamp(start), pd.Timestamp(end)
+    months = months_in_range(start, end)
+    if not months:
+        return empty_frame()
+
+    workers = max(1, min(REPORT_QUERY_WORKERS, len(months)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        frames = list(pool.map(
+            lambda month: _filter_month(month, start, end, employee_id, event_name), months))
+
+    frames = [f for f in frames if f is not None and not f.empty]
+    if not frames:
+        return empty_frame()
+    return concat_frames(frames).sort_values("Date", kind="stable")
+
+# Totals for a query result, overall and grouped by month, employee and event.
+# Amounts are added up in whole cents and only turned back into rands at the end.
+def summarise(df):
+    if df.empty:
+        return {"total": 0.0, "rows": 0, "by_month": [], "by_employee": [], "by_event": []}
+
+    df = df.assign(cents=amount_cents(df))
+    amount = df["cents"]
+    by_month = amount.groupby(df["Date"].dt.strftime("%Y%m")).sum()
+    by_employee = (
+        df.groupby(["Employee ID", "Surname", "Name"], observed=True)["cents"]
+          .agg(["sum", "count"])
+          .reset_index()
+          .sort_values(["Surname", "Name"])
+    )
+    by_event = (
+        df.groupby("Event Name", observed=True)["cents"]
+          .agg(["sum", "count"])
+          .reset_index()
+          .sort_values("Event Name")
+    )
+
+    return {
+        "total": int(amount.sum()) / 100,
+        "rows": len(df),
+        "by_month": [
+            {"month": month, "total": int(total) / 100}
+            for month, total in by_month.items()
+        ],
+        "by_employee": [
+            {"id": r["Employee ID"], "surname": r["Surname"], "name": r["Name"],
+             "total": int(r["sum"]) / 100, "count": int(r["count"])}
+            for r in by_employee.to_dict(orient="records")
+        ],
+        "by_event": [
+            {"name": r["Event Name"], "total": int(r["sum"]) / 100, "count": int(r["count"])}
+            for r in by_event.to_dict(orient="records")
+        ]
+    }
@@ -0,0 +1,76 @@
+import os
+import tempfile
+from contextlib import contextmanager
+from config import CSV_ENCODING
+
+# fcntl only exists on Unix. Without it the locks are skipped, which is fine
+# for the single-process development server.
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# ──────────────────────────────────────
+# 🔒 Locked, Atomic File Writes
+# ──────────────────────────────────────
+
+# With several gunicorn workers, two requests can edit the same CSV at once.
+# Every write takes an advisory lock on a "<file>.lock" next to the data file,
+# and whole-file rewrites go through a temp file + os.replace, so readers
+# always see either the old file or the new one, never half of it.
+
+# Holds an exclusive (writers) or shared (readers) lock for the duration of the block.
+# The lock lives in its own file, so it survives the data file being replaced.
+@contextmanager
+def file_lock(path, shared=False):
+    if fcntl is None:
+        yield
+        return
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(f"{path}.lock", "a") as lock_file:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+# Writes bytes to a temp file in the same folder, fsyncs it and swaps it into place.
+def atomic_write_bytes(path, data):
+    folder = os.path.dirname(path) or "."
+    os.makedirs(folder, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=folder, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+# Same as atomic_write_bytes, for a DataFrame written as CSV.
+def atomic_write_csv(df, path):
+    atomic_write_bytes(path, df.to_csv(index=False).encode(CSV_ENCODING))
+
+# ──────────────────────────────────────
+# 🧽 Normalise on Write
+# ──────────────────────────────────────
+
+# Stray spaces used to be stripped from every cell on every read. Values are now
+# stripped once, when they are written, so reads can compare them as they are.
+
+# Strips the keys and string values of one row before it is saved.
+def normalise_record(record):
+    return {str(key).strip(): value.strip() if isinstance(value, str) else value
+            for key, value in record.items()}
+
+# Strips the column names and every text column of a frame, one vectorised call per column.
+def normalise_frame(df):
+    df = df.copy()
+    df.columns = df.columns.str.strip()
+    for col in df.select_dtypes(include="object").columns:
+        df[col] = df[col].str.strip()
+    return df
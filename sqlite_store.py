@@ -0,0 +1,322 @@
+import os
+import sqlite3
+import threading
+from config import SQLITE_PATH, EMPLOYEE_CSV
+from instrumentation import span
+from safe_write import file_lock, atomic_write_csv, normalise_record, normalise_frame
+from employee_store import EMPLOYEE_COLUMNS, EmployeeStore
+from employee_search import PrefixIndex
+from event_store import (
+    EVENT_COLUMNS, encode_event_id, decode_event_id, month_csv_path, read_month_csv, to_typed_frame,
+    list_months as list_csv_months
+)
+from lazy_imports import lazy_import
+
+pd = lazy_import("pandas")
+
+# ──────────────────────────────────────
+# 🗄️ SQLite Storage
+# ──────────────────────────────────────
+
+# A drop-in replacement for the CSV files, used when STORAGE_BACKEND = "sqlite".
+# Employees and event rows live in two tables whose columns have the same names
+# as the CSV headers, so the frames and dicts the routes get back look the same.
+# Lookups by ID, by event and by date range are index queries instead of full
+# scans, and the database runs in WAL mode so reports never block event saves.
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS employees (
+    "ID Number" TEXT PRIMARY KEY,
+    "Surname"   TEXT NOT NULL DEFAULT '',
+    "Name"      TEXT NOT NULL DEFAULT '',
+    "Contact"   TEXT NOT NULL DEFAULT ''
+);
+CREATE TABLE IF NOT EXISTS events (
+    "Event Name"     TEXT NOT NULL,
+    "Date"           TEXT NOT NULL,
+    "Amount Payable" REAL NOT NULL,
+    "Employee ID"    TEXT NOT NULL,
+    "Name"           TEXT NOT NULL DEFAULT '',
+    "Surname"        TEXT NOT NULL DEFAULT '',
+    "Contact"        TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS events_by_event ON events ("Event Name", "Date");
+CREATE INDEX IF NOT EXISTS events_by_date ON events ("Date");
+CREATE INDEX IF NOT EXISTS events_by_employee ON events ("Employee ID");
+"""
+
+def _columns(columns):
+    return ", ".join(f'"{col}"' for col in columns)
+
+def _placeholders(count):
+    return ", ".join("?" * count)
+
+EMPLOYEE_SELECT = f"SELECT {_columns(EMPLOYEE_COLUMNS)} FROM employees"
+EVENT_SELECT = f"SELECT {_columns(EVENT_COLUMNS)} FROM events"
+EMPLOYEE_INSERT = f"INSERT OR REPLACE INTO employees ({_columns(EMPLOYEE_COLUMNS)}) VALUES ({_placeholders(len(EMPLOYEE_COLUMNS))})"
+# Updates an existing employee in place, so it keeps its rowid (and its place in records())
+EMPLOYEE_UPSERT = (
+    f"INSERT INTO employees ({_columns(EMPLOYEE_COLUMNS)}) VALUES ({_placeholders(len(EMPLOYEE_COLUMNS))}) "
+    'ON CONFLICT ("ID Number") DO UPDATE SET '
+    + ", ".join(f'"{col}" = excluded."{col}"' for col in EMPLOYEE_COLUMNS[1:])
+)
+EVENT_INSERT = f"INSERT INTO events ({_columns(EVENT_COLUMNS)}) VALUES ({_placeholders(len(EVENT_COLUMNS))})"
+
+# SQLite limits the number of ? in one statement, so long IN (...) lists are split up.
+MAX_PARAMS = 500
+
+# One connection per thread (and per process, since a forked worker can't share its parent's).
+_local = threading.local()
+
+def connect():
+    if getattr(_local, "pid", None) != os.getpid():
+        os.makedirs(os.path.dirname(SQLITE_PATH) or ".", exist_ok=True)
+        conn = sqlite3.connect(SQLITE_PATH, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(SCHEMA)
+        _local.conn, _local.pid = conn, os.getpid()
+    return _local.conn
+
+# Runs a query and returns the rows as dicts keyed by column name.
+def _fetch(sql, params=()):
+    with span("sqlite"):
+        cursor = connect().execute(sql, params)
+        columns = [col[0] for col in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+# Event rows as the typed frame the routes work with (see event_store.to_typed_frame).
+def _event_frame(where="", params=()):
+    return to_typed_frame(pd.DataFrame(_fetch(f"{EVENT_SELECT} {where}", params), columns=EVENT_COLUMNS))
+
+def _event_values(row):
+    return tuple(
+        float(row.get(col) or 0) if col == "Amount Payable" else str(row.get(col, ""))
+        for col in EVENT_COLUMNS
+    )
+
+# The first and last date of a YYYYMM month. Dates are stored as YYYY-MM-DD text, so they compare in order.
+def _month_bounds(month):
+    return f"{month[:4]}-{month[4:6]}-01", f"{month[:4]}-{month[4:6]}-31"
+
+# Same as event_store.data_version. Every write lands in the WAL file first, so the
+# database and WAL files together change with every commit, whatever the month.
+def data_version(month=None):
+    stats = []
+    for path in (SQLITE_PATH, f"{SQLITE_PATH}-wal"):
+        try:
+            stats.append(os.stat(path))
+        except FileNotFoundError:
+            pass
+    if not stats:
+        return None
+    return "-".join(f"{s.st_mtime_ns:x}-{s.st_size:x}" for s in stats), max(s.st_mtime for s in stats)
+
+# ──────────────────────────────────────
+# 👥 Employees
+# ──────────────────────────────────────
+
+# Same methods as employee_store.EmployeeStore, backed by the employees table.
+class SqliteEmployeeStore:
+    def __init__(self):
+        # (data_version, PrefixIndex) of the last search
+        self._search = (None, None)
+
+    # ── Reads ───────────────────────────────
+
+    def frame(self):
+        return pd.DataFrame(self.records(), columns=EMPLOYEE_COLUMNS)
+
+    def records(self):
+        return _fetch(f"{EMPLOYEE_SELECT} ORDER BY rowid")
+
+    def sorted_by_surname(self):
+        return _fetch(f'{EMPLOYEE_SELECT} ORDER BY "Surname", rowid')
+
+    def get(self, id_number):
+        rows = _fetch(f'{EMPLOYEE_SELECT} WHERE "ID Number" = ?', (str(id_number).strip(),))
+        return rows[0] if rows else None
+
+    def __contains__(self, id_number):
+        return self.get(id_number) is not None
+
+    def get_many(self, id_numbers):
+        wanted = list(dict.fromkeys(str(i).strip() for i in id_numbers))
+        by_id = {}
+        for start in range(0, len(wanted), MAX_PARAMS):
+            chunk = wanted[start:start + MAX_PARAMS]
+            for row in _fetch(f'{EMPLOYEE_SELECT} WHERE "ID Number" IN ({_placeholders(len(chunk))})', chunk):
+                by_id[row["ID Number"]] = row
+        return [by_id[i] for i in wanted if i in by_id], [i for i in wanted if i not in by_id]
+
+    # Same as EmployeeStore.search. The index is rebuilt whenever the database changed.
+    def search(self, query, offset=0, limit=20):
+        version, index = self._search
+        if index is None or version != data_version():
+            version = data_version()
+            index = PrefixIndex(self.sorted_by_surname())
+            self._search = (version, index)
+        return index.search(query, offset, limit)
+
+    # ── Writes ──────────────────────────────
+
+    def add(self, record):
+        record = normalise_record(record)
+        with connect() as conn:
+            conn.execute(EMPLOYEE_INSERT, tuple(record.get(col, "") for col in EMPLOYEE_COLUMNS))
+
+    # Fields the form left out (None) are saved empty, as EmployeeStore.update writes them.
+    def update(self, id_number, fields):
+        fields = {col: "" if value is None else value
+                  for col, value in normalise_record(fields).items() if col in EMPLOYEE_COLUMNS}
+        if not fields:
+            return
+        assignments = ", ".join(f'"{col}" = ?' for col in fields)
+        with connect() as conn:
+            conn.execute(f'UPDATE employees SET {assignments} WHERE "ID Number" = ?',
+                         (*fields.values(), str(id_number).strip()))
+
+    # Same as EmployeeStore.upsert_many, in one transaction. Returns (inserted, updated).
+    def upsert_many(self, records):
+        records = normalise_frame(records.reindex(columns=EMPLOYEE_COLUMNS, fill_value=""))
+        records = records.drop_duplicates("ID Number", keep="last")
+        with connect() as conn:
+            found, _ = self.get_many(records["ID Number"])
+            conn.executemany(EMPLOYEE_UPSERT, records.itertuples(index=False, name=None))
+        return len(records) - len(found), len(found)
+
+    def remove(self, id_number):
+        with connect() as conn:
+            conn.execute('DELETE FROM employees WHERE "ID Number" = ?', (str(id_number).strip(),))
+
+    # Values are stripped when they are written, so there is never anything to clean up.
+    def normalise(self):
+        return False
+
+# ──────────────────────────────────────
+# 📅 Events
+# ──────────────────────────────────────
+
+# The same functions event_store provides for the CSV files.
+
+def load_month(month):
+    first, last = _month_bounds(month)
+    df = _event_frame('WHERE "Date" BETWEEN ? AND ? ORDER BY rowid', (first, last))
+    return None if df.empty else df
+
+def list_months():
+    return [row["month"] for row in _fetch(
+        """SELECT DISTINCT substr("Date", 1, 4) || substr("Date", 6, 2) AS month
+           FROM events ORDER BY month""")]
+
+def list_events(month):
+    first, last = _month_bounds(month)
+    rows = _fetch(
+        'SELECT DISTINCT "Event Name" AS name, "Date" AS date FROM events '
+        'WHERE "Date" BETWEEN ? AND ? ORDER BY "Date" DESC, "Event Name"', (first, last))
+    return [{"name": r["name"], "date": r["date"], "id": encode_event_id(r["date"], r["name"])} for r in rows]
+
+# An event_id that can't be decoded matches nothing, as in the CSV index.
+def event_rows(month, event_id):
+    try:
+        date, name = decode_event_id(event_id)
+    except ValueError:
+        return _event_frame("WHERE 0")
+    first, last = _month_bounds(month)
+    if not first <= date <= last:
+        return _event_frame("WHERE 0")
+    return _event_frame('WHERE "Event Name" = ? AND "Date" = ? ORDER BY rowid', (name, date))
+
+# Same as event_store.month_summary, as GROUP BY queries over the month's date range.
+# Amounts are summed in cents, the way the CSV index keeps them.
+def month_summary(month):
+    first, last = _month_bounds(month)
+    params = (first, last)
+    cents = 'CAST(ROUND("Amount Payable" * 100) AS INTEGER)'
+    totals = _fetch(f'SELECT COUNT(*) AS count, COALESCE(SUM({cents}), 0) AS total '
+                    'FROM events WHERE "Date" BETWEEN ? AND ?', params)[0]
+    if not totals["count"]:
+        return None
+
+    # Name and surname as they were on the employee's latest row
+    employees = _fetch(
+        f'SELECT "Employee ID" AS id, "Surname" AS surname, "Name" AS name, '
+        f'SUM({cents}) AS total, COUNT(*) AS count, MAX(rowid) '
+        'FROM events WHERE "Date" BETWEEN ? AND ? GROUP BY "Employee ID"', params)
+    events = _fetch(
+        f'SELECT "Event Name" AS name, "Date" AS date, SUM({cents}) AS total, COUNT(*) AS count '
+        'FROM events WHERE "Date" BETWEEN ? AND ? GROUP BY "Event Name", "Date"', params)
+
+    return {
+        "month": month,
+        "rows": totals["count"],
+        "total": totals["total"] / 100,
+        "by_employee": sorted(
+            ({"id": e["id"], "surname": e["surname"], "name": e["name"],
+              "total": e["total"] / 100, "count": e["count"]} for e in employees),
+            key=lambda e: (e["surname"], e["name"], e["id"])),
+        "by_event": sorted(
+            ({"id": encode_event_id(e["date"], e["name"]), "name": e["name"], "date": e["date"],
+              "total": e["total"] / 100, "count": e["count"]} for e in events),
+            key=lambda e: (e["date"], e["name"]))
+    }
+
+def append_rows(month, rows):
+    with connect() as conn:
+        conn.executemany(EVENT_INSERT, [_event_values(row) for row in rows])
+
+# Same as report_query.query_events, as one indexed query over the date range.
+def query_events(start, end, employee_id=None, event_name=None):
+    where, params = ['"Date" BETWEEN ? AND ?'], [f"{start:%Y-%m-%d}", f"{end:%Y-%m-%d}"]
+    if employee_id:
+        where.append('"Employee ID" = ?')
+        params.append(employee_id)
+    if event_name:
+        where.append('"Event Name" = ?')
+        params.append(event_name)
+    return _event_frame(f'WHERE {" AND ".join(where)} ORDER BY "Date", rowid', params)
+
+# ──────────────────────────────────────
+# 🔁 CSV Import / Export
+# ──────────────────────────────────────
+
+# Replaces everything in the database with the contents of the CSV files.
+# Rows with a date or amount that can't be parsed are skipped and counted.
+# Returns (employees imported, event rows imported, event rows skipped).
+def import_csv():
+    employees = normalise_frame(EmployeeStore(EMPLOYEE_CSV).frame())
+    imported = skipped = 0
+
+    with connect() as conn:
+        conn.execute("DELETE FROM employees")
+        conn.execute("DELETE FROM events")
+        conn.executemany(EMPLOYEE_INSERT, employees.reindex(columns=EMPLOYEE_COLUMNS, fill_value="")
+                                                   .itertuples(index=False, name=None))
+
+        for month in list_csv_months():
+            df = normalise_frame(read_month_csv(month)).reindex(columns=EVENT_COLUMNS, fill_value="")
+            valid = df["Date"].notna() & df["Amount Payable"].notna()
+            df = df[valid].assign(Date=df.loc[valid, "Date"].dt.strftime("%Y-%m-%d"))
+            conn.executemany(EVENT_INSERT, df.itertuples(index=False, name=None))
+            imported += len(df)
+            skipped += int((~valid).sum())
+
+    return len(employees), imported, skipped
+
+# Writes the database back out as employee_data.csv and one YYYYMM.csv per month,
+# in the same format the CSV backend writes, so the app can switch back at any time.
+# Returns (employees exported, months exported).
+def export_csv():
+    employees = SqliteEmployeeStore().frame()
+    with file_lock(EMPLOYEE_CSV):
+        atomic_write_csv(employees, EMPLOYEE_CSV)
+
+    months = list_months()
+    for month in months:
+        df = load_month(month)
+        df = df.assign(Date=df["Date"].dt.strftime("%Y-%m-%d"))
+        df["Amount Payable"] = df["Amount Payable"].map("{:.2f}".format)
+        with file_lock(month_csv_path(month)):
+            atomic_write_csv(df, month_csv_path(month))
+
+    return len(employees), len(months)
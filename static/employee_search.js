@@ -0,0 +1,42 @@
+// 🔎 Employee Typeahead
+// Fills an employee dropdown with the employees matching what is typed into a search box.
+// The matches come a page at a time from /search-employees, so the page no longer
+// has the whole roster rendered into it. The dropdown keeps working the way it did,
+// its options still have the ID number as value and "Surname, Name" as text.
+function employeeTypeahead(input, select, pageSize = 50) {
+    let searchId = 0;
+    let timer = null;
+
+    const search = () => {
+        // Only the answer to the latest search is shown
+        const currentSearch = ++searchId;
+
+        fetch(`/search-employees?q=${encodeURIComponent(input.value)}&limit=${pageSize}`)
+            .then(res => res.json())
+            .then(data => {
+                if (currentSearch !== searchId) return;
+
+                select.innerHTML = `<option value="" disabled selected>Selection</option>`;
+                data.employees.forEach(e => {
+                    select.appendChild(new Option(`${e.surname}, ${e.name}`, e.id));
+                });
+
+                // Tell the user there is more than fits in the list
+                const more = data.total - data.employees.length;
+                if (more > 0) {
+                    const hint = new Option(`… ${more} more, keep typing to narrow the list down`, "");
+                    hint.disabled = true;
+                    select.appendChild(hint);
+                }
+            })
+            .catch(err => console.error("Employee search failed:", err));
+    };
+
+    // Wait for a short pause in the typing before asking the server
+    input.addEventListener("input", () => {
+        clearTimeout(timer);
+        timer = setTimeout(search, 150);
+    });
+
+    search();
+}
@@ -0,0 +1,24 @@
+from config import STORAGE_BACKEND
+
+# ──────────────────────────────────────
+# 🗄️ Storage Backend
+# ──────────────────────────────────────
+
+# The routes read and write employees and events only through the names below.
+# They come from the CSV modules (employee_store, event_store, report_query) or
+# from sqlite_store, depending on STORAGE_BACKEND in config.py.
+if STORAGE_BACKEND == "sqlite":
+    from sqlite_store import (
+        SqliteEmployeeStore, load_month, list_months, list_events, event_rows,
+        month_summary, data_version, query_events, append_rows as append_event_rows
+    )
+    employee_store = SqliteEmployeeStore()
+elif STORAGE_BACKEND == "csv":
+    from employee_store import employee_store
+    from event_store import (
+        load_month, list_months, list_events, event_rows,
+        month_summary, data_version, append_rows as append_event_rows
+    )
+    from report_query import query_events
+else:
+    raise ValueError(f'Unknown STORAGE_BACKEND "{STORAGE_BACKEND}", expected "csv" or "sqlite"')
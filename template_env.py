@@ -0,0 +1,71 @@
+import functools
+import os
+from jinja2 import Environment, FileSystemLoader, FileSystemBytecodeCache, select_autoescape
+from config import TEMPLATE_CACHE_DIR, TEMPLATE_AUTO_RELOAD
+
+# ──────────────────────────────────────
+# 🧠 Shared Jinja2 Environment
+# ──────────────────────────────────────
+
+# One environment renders everything that ends up in a PDF: the employee form
+# pack (pdf_forms.py) and the monthly reports (report_pdf.py). Compiled templates
+# are written to TEMPLATE_CACHE_DIR, so a freshly started worker loads them from
+# there instead of parsing and compiling every template again.
+#
+# .html templates are escaped, the same as Flask's render_template does.
+# Template files are only checked for changes when TEMPLATE_AUTO_RELOAD is on.
+#
+# So an edited template isn't rendered until a restart, while the file on disk
+# already has the new source. The PDF cache key (see pdf_cache.make_key) is
+# therefore taken from the source the environment loaded, not from the file,
+# and a PDF is always cached under the template it was rendered from.
+
+os.makedirs(TEMPLATE_CACHE_DIR, exist_ok=True)
+BYTECODE_CACHE = FileSystemBytecodeCache(TEMPLATE_CACHE_DIR)
+
+# Keeps the source of every template it loads, by name.
+class SourceRecordingLoader(FileSystemLoader):
+    def __init__(self, searchpath):
+        super().__init__(searchpath)
+        self.sources = {}
+
+    def get_source(self, environment, template):
+        source, filename, uptodate = super().get_source(environment, template)
+        self.sources[template] = source
+        return source, filename, uptodate
+
+env = Environment(
+    loader=SourceRecordingLoader("templates"),
+    autoescape=select_autoescape(),
+    bytecode_cache=BYTECODE_CACHE,
+    auto_reload=TEMPLATE_AUTO_RELOAD
+)
+
+# Stylesheets are read by WeasyPrint, not by Jinja. They are read once per process
+# as well, unless TEMPLATE_AUTO_RELOAD is on.
+def _read(name):
+    with open(os.path.join("templates", name), "rb") as f:
+        return f.read()
+
+@functools.cache
+def _read_once(name):
+    return _read(name)
+
+def stylesheet_source(name):
+    return _read(name) if TEMPLATE_AUTO_RELOAD else _read_once(name)
+
+# The source of a template or stylesheet exactly as the PDFs are rendered from it, as bytes.
+def loaded_source(name):
+    if name.endswith(".css"):
+        return stylesheet_source(name)
+    env.get_template(name)
+    return env.loader.sources[name].encode("utf-8")
+
+# Loads (and compiles, if the bytecode cache doesn't have them yet) the given templates
+# and stylesheets, so the first request after a deploy doesn't pay for it. Render workers
+# are forked from the app process later on, so they render these same sources.
+# Returns how many were loaded.
+def warm_up(template_names):
+    for name in template_names:
+        loaded_source(name)
+    return len(template_names)
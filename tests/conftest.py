@@ -0,0 +1,64 @@
+import os
+import shutil
+import sys
+import threading
+
+import pytest
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+# The names app.py takes from storage.py, see the storage backend switch there
+STORAGE_NAMES = ["load_month", "list_months", "list_events", "event_rows", "month_summary",
+                 "data_version", "query_events"]
+
+
+# Runs the test in a scratch folder with a copy of the sample data, so nothing a test
+# writes ends up in data/. The paths in config.py are relative, so they point in here.
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    for folder in ["templates", "static"]:
+        os.symlink(os.path.join(PROJECT_ROOT, folder), tmp_path / folder)
+    shutil.copytree(os.path.join(PROJECT_ROOT, "data", "employees"), tmp_path / "data" / "employees")
+    events = tmp_path / "data" / "events"
+    events.mkdir()
+    for name in os.listdir(os.path.join(PROJECT_ROOT, "data", "events")):
+        if name.endswith(".csv"):
+            shutil.copy(os.path.join(PROJECT_ROOT, "data", "events", name), events / name)
+    # template_env.py only creates its cache folder when it is first imported
+    (tmp_path / "data" / "cache" / "templates").mkdir(parents=True)
+    monkeypatch.chdir(tmp_path)
+
+    import event_store
+    import sqlite_store
+    event_store.invalidate_catalogue()
+    monkeypatch.setattr(sqlite_store, "_local", threading.local())
+    return tmp_path
+
+
+@pytest.fixture
+def app_module(workdir, monkeypatch):
+    import app
+    from config import EMPLOYEE_CSV
+    from employee_store import EmployeeStore
+    monkeypatch.setattr(app, "employee_store", EmployeeStore(EMPLOYEE_CSV))
+    return app
+
+
+# The app once per storage backend. The SQLite database is filled from the sample CSVs.
+@pytest.fixture(params=["csv", "sqlite"])
+def backend(request, app_module, monkeypatch):
+    if request.param == "sqlite":
+        import sqlite_store
+        import utils
+        sqlite_store.import_csv()
+        for name in STORAGE_NAMES:
+            monkeypatch.setattr(app_module, name, getattr(sqlite_store, name))
+        monkeypatch.setattr(utils, "append_event_rows", sqlite_store.append_rows)
+        monkeypatch.setattr(app_module, "employee_store", sqlite_store.SqliteEmployeeStore())
+    return app_module
+
+
+@pytest.fixture
+def client(backend):
+    return backend.app.test_client()
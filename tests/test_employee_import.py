@@ -0,0 +1,29 @@
+import io
+
+from employee_import import read_upload, validate
+
+UPLOAD = (
+    "ID Number,Surname,Name,Contact\n"
+    "9001015009087,Botha,,0821234567\n"
+    "12345,Smit,Leah,0821234567\n"
+    "9001015009087,Botha,Jan,0821234567\n"
+)
+
+
+# The import applies the add form's rules, plus the check for IDs repeated in the file
+def test_validate_matches_the_add_form():
+    df = read_upload(io.BytesIO(UPLOAD.encode()))
+    valid, errors = validate(df, existing_ids=[])
+
+    assert valid.empty
+    assert [e["row"] for e in errors] == [2, 3, 4]
+    assert errors[0]["errors"] == ["This ID number appears more than once in the file."]
+    assert errors[1]["errors"] == ["ID number must be a 13-digit number."]
+
+
+def test_blank_name_is_accepted_like_the_add_form():
+    header_and_first_row = "".join(UPLOAD.splitlines(True)[:2])
+    df = read_upload(io.BytesIO(header_and_first_row.encode()))
+    valid, errors = validate(df, existing_ids=[])
+    assert errors == []
+    assert valid["Name"].tolist() == [""]
@@ -0,0 +1,56 @@
+from config import EMPLOYEE_CSV
+from employee_search import PrefixIndex
+from employee_store import EmployeeStore
+
+ROSTER = [
+    {"ID Number": "9004123456087", "Surname": "Molewa", "Name": "Thabo"},
+    {"ID Number": "8512236784095", "Surname": "van der Merwe", "Name": "Elsie"},
+    {"ID Number": "9205302345076", "Surname": "Moatshe", "Name": "Kopano"},
+    {"ID Number": "7807155123092", "Surname": "Mokoena", "Name": "Thabang"},
+]
+
+
+def names(records):
+    return [record["Name"] for record in records]
+
+
+# A prefix covers exactly the words that start with it, and no neighbouring ones
+def test_prefix_bounds():
+    index = PrefixIndex(ROSTER)
+    assert names(index.search("mo")[1]) == ["Thabo", "Kopano", "Thabang"]
+    assert names(index.search("mok")[1]) == ["Thabang"]
+    assert names(index.search("molewa")[1]) == ["Thabo"]
+    assert index.search("molewas") == (0, [])
+    assert index.search("zz") == (0, [])
+    # The ID number is a word too
+    assert names(index.search("85")[1]) == ["Elsie"]
+
+
+def test_every_word_of_the_query_has_to_match():
+    index = PrefixIndex(ROSTER)
+    assert names(index.search("tha mo")[1]) == ["Thabo", "Thabang"]
+    assert names(index.search("MOL tha")[1]) == ["Thabo"]
+    assert names(index.search("der van")[1]) == ["Elsie"]
+    assert index.search("tha merwe") == (0, [])
+
+
+def test_empty_query_pages_through_everyone():
+    index = PrefixIndex(ROSTER)
+    assert index.search("   ") == (4, ROSTER[:20])
+    assert index.search("", offset=1, limit=2) == (4, ROSTER[1:3])
+
+
+def test_store_search_follows_writes(workdir):
+    store = EmployeeStore(EMPLOYEE_CSV)
+    assert store.search("zulu") == (0, [])
+
+    store.add({"ID Number": "1234567890123", "Surname": "Zulu", "Name": "Ann", "Contact": "0123456789"})
+    assert names(store.search("zulu")[1]) == ["Ann"]
+
+    store.update("1234567890123", {"Name": "Anne"})
+    assert names(store.search("zulu")[1]) == ["Anne"]
+    assert store.search("ann zulu")[0] == 1
+    assert store.search("zulu anna") == (0, [])
+
+    store.remove("1234567890123")
+    assert store.search("zulu") == (0, [])
@@ -0,0 +1,98 @@
+import json
+import multiprocessing
+
+import pandas as pd
+
+import event_archive
+import event_store
+from utils import save_event_rows
+
+
+def event_row(employee_id="9004123456087", date="2025-05-03"):
+    return {"Event Name": "Cleaning Shop", "Date": date, "Amount Payable": "120.50",
+            "Employee ID": employee_id, "Name": "Thabo", "Surname": "Molewa", "Contact": "0634567890"}
+
+
+# strptime accepts an unpadded date, the saved rows and the event ID must not keep it
+def test_unpadded_date_is_saved_zero_padded(workdir):
+    # With a fresh sidecar and index the save extends them instead of rebuilding
+    event_store.load_index("202505")
+    save_event_rows([event_row(date="2025-5-3")], "2025-5-3")
+
+    before_rebuild = [e["id"] for e in event_store.list_events("202505")]
+    assert "2025-05-03_Cleaning_Shop" in before_rebuild
+
+    event_store._rebuild_index("202505")
+    assert [e["id"] for e in event_store.list_events("202505")] == before_rebuild
+
+
+# The index extended by an append matches the one built from the whole month
+def test_extended_index_matches_a_full_build(workdir):
+    event_store.load_index("202505")
+    rows = [
+        event_row(),
+        event_row(employee_id="9207102345012", date="2025-05-02"),
+        dict(event_row(employee_id="0101015800089", date="2025-05-31"), **{"Event Name": "Stock Take"}),
+        dict(event_row(), **{"Amount Payable": "not a number"}),
+    ]
+    event_store.append_rows("202505", rows)
+    assert event_store.index_is_fresh("202505")
+
+    extended = event_store._read_index("202505")
+    built = json.loads(json.dumps(event_store.build_index(event_store.read_month_csv("202505"))))
+    assert {key: value for key, value in extended.items() if key != "csv"} == built
+
+
+# Reading an archived month writes its sidecar and index into the event folder, which
+# must not make the catalogue open every archive again
+def test_reading_an_archived_month_does_not_rescan_the_archives(workdir, monkeypatch):
+    assert event_archive.compact(before="202506") == {"2025": ["202505"]}
+
+    scanned = []
+    archived_months = event_store._archived_months
+    monkeypatch.setattr(event_store, "_archived_months", lambda path: scanned.append(path) or archived_months(path))
+
+    for _ in range(2):
+        assert event_store.is_archived("202505")
+        assert len(event_store.load_month("202505")) > 0
+        assert event_store.list_events("202505")
+    assert len(scanned) == 1
+
+
+# After an append the sidecar is still trusted, and holds the new rows
+def test_sidecar_is_fresh_after_an_append(workdir):
+    before = len(event_store.load_month("202505"))
+    event_store.append_rows("202505", [event_row(), event_row(date="2025-05-04")])
+
+    assert event_store.sidecar_is_fresh("202505")
+    sidecar = event_store._read_sidecar("202505")
+    assert len(sidecar) == before + 2
+    pd.testing.assert_frame_equal(sidecar, event_store.read_month_csv("202505"), check_categorical=False)
+
+
+def append_batches(worker, batches):
+    for batch in range(batches):
+        event_store.append_rows("202505", [
+            event_row(employee_id=f"{worker:06d}{batch:03d}{row:04d}") for row in range(5)])
+
+
+# Workers appending to the same month at once, each in its own process like the app's workers
+def test_concurrent_appends_keep_every_row(workdir):
+    before = len(event_store.load_month("202505"))
+    event_store.load_index("202505")
+
+    context = multiprocessing.get_context("fork")
+    workers = [context.Process(target=append_batches, args=(worker, 10)) for worker in range(4)]
+    for process in workers:
+        process.start()
+    for process in workers:
+        process.join()
+    assert [process.exitcode for process in workers] == [0] * 4
+
+    df = event_store.read_month_csv("202505")
+    assert len(df) == before + 4 * 10 * 5
+    assert df["Employee ID"].str.len().eq(13).all()
+    assert event_store.sidecar_is_fresh("202505")
+    assert len(event_store._read_sidecar("202505")) == len(df)
+    assert event_store.index_is_fresh("202505")
+    assert event_store.load_index("202505")["rows"] == len(df)
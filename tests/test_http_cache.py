@@ -0,0 +1,100 @@
+import gzip
+import zlib
+
+import pytest
+from flask import Flask, Response, jsonify
+
+import http_cache
+from config import COMPRESS_MIN_BYTES
+from http_cache import conditional
+
+LAST_MODIFIED = 1748736000  # 2025-06-01
+
+
+# A small app with the same after_request hook as app.py, so every case is explicit
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    http_cache.init_app(app)
+    app.chunks_sent = 0
+
+    @app.route("/versioned")
+    @conditional(lambda: ("v1", LAST_MODIFIED))
+    def versioned():
+        return jsonify(rows=["Cleaning Shop"] * 200)
+
+    @app.route("/small")
+    def small():
+        return jsonify(rows=["Cleaning Shop"])
+
+    @app.route("/large")
+    def large():
+        return jsonify(rows=["Cleaning Shop"] * 200)
+
+    @app.route("/stream")
+    def stream():
+        def rows():
+            for n in range(3):
+                app.chunks_sent += 1
+                yield f'{{"row": {n}}}\n'
+        return Response(rows(), mimetype="application/x-ndjson")
+
+    return app
+
+
+def test_weak_etag_gives_a_304(app):
+    client = app.test_client()
+    first = client.get("/versioned", headers={"Accept-Encoding": "gzip"})
+    assert first.status_code == 200
+    assert first.headers["ETag"] == 'W/"v1"'
+    assert first.headers["Content-Encoding"] == "gzip"
+
+    # The browser sends back the ETag of the compressed response, weak or not
+    for etag in ['W/"v1"', '"v1"']:
+        again = client.get("/versioned", headers={"If-None-Match": etag})
+        assert again.status_code == 304
+        assert again.data == b""
+
+    assert client.get("/versioned", headers={"If-None-Match": 'W/"v0"'}).status_code == 200
+
+
+def test_compressible_responses_vary_on_accept_encoding(app):
+    client = app.test_client()
+    for headers in [{}, {"Accept-Encoding": "gzip"}]:
+        response = client.get("/large", headers=headers)
+        assert "Accept-Encoding" in response.headers["Vary"]
+    assert "Content-Encoding" not in client.get("/large").headers
+
+
+def test_small_bodies_stay_uncompressed(app):
+    response = app.test_client().get("/small", headers={"Accept-Encoding": "gzip"})
+    assert len(response.data) < COMPRESS_MIN_BYTES
+    assert "Content-Encoding" not in response.headers
+    assert response.get_json() == {"rows": ["Cleaning Shop"]}
+
+    response = app.test_client().get("/large", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(response.data).count(b"Cleaning Shop") == 200
+
+
+# Each chunk is compressed and flushed as it comes, the rows after it aren't read yet
+def test_streamed_responses_are_not_buffered(app):
+    response = app.test_client().get("/stream", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Content-Length" not in response.headers
+
+    decompressor = zlib.decompressobj(31)
+    chunks = iter(response.response)
+    assert decompressor.decompress(next(chunks)) == b'{"row": 0}\n'
+    assert app.chunks_sent == 1
+
+    rest = b"".join(decompressor.decompress(chunk) for chunk in chunks)
+    assert rest == b'{"row": 1}\n{"row": 2}\n'
+    assert app.chunks_sent == 3
+
+
+def test_brotli_is_preferred_over_gzip(app):
+    brotli = pytest.importorskip("brotli")
+    response = app.test_client().get("/large", headers={"Accept-Encoding": "gzip, deflate, br"})
+    assert response.headers["Content-Encoding"] == "br"
+    assert brotli.decompress(response.data).count(b"Cleaning Shop") == 200
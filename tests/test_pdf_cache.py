@@ -0,0 +1,38 @@
+import os
+
+from jinja2 import Environment
+
+import pdf_cache
+import template_env
+from template_env import SourceRecordingLoader
+
+
+def template_folder(tmp_path, monkeypatch, auto_reload):
+    (tmp_path / "templates").mkdir()
+    (tmp_path / "templates" / "form.html").write_text("<p>{{ name }}</p>")
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(template_env, "env", Environment(loader=SourceRecordingLoader("templates"),
+                                                         auto_reload=auto_reload))
+    return tmp_path / "templates" / "form.html"
+
+
+# Without auto reload an edited template is only rendered after a restart,
+# so its PDFs keep the key of the source that is still rendered until then
+def test_key_follows_the_loaded_template_not_the_file(tmp_path, monkeypatch):
+    path = template_folder(tmp_path, monkeypatch, auto_reload=False)
+    key = pdf_cache.make_key([{"name": "Thabo"}], ["form.html"], {})
+
+    path.write_text("<h1>{{ name }}</h1>")
+    assert template_env.env.get_template("form.html").render(name="Thabo") == "<p>Thabo</p>"
+    assert pdf_cache.make_key([{"name": "Thabo"}], ["form.html"], {}) == key
+
+
+def test_key_changes_with_the_template_under_auto_reload(tmp_path, monkeypatch):
+    path = template_folder(tmp_path, monkeypatch, auto_reload=True)
+    key = pdf_cache.make_key([{"name": "Thabo"}], ["form.html"], {})
+
+    path.write_text("<h1>{{ name }}</h1>")
+    # Moved forward, so the change is seen even within one mtime tick
+    os.utime(path, (path.stat().st_atime + 10, path.stat().st_mtime + 10))
+    assert template_env.env.get_template("form.html").render(name="Thabo") == "<h1>Thabo</h1>"
+    assert pdf_cache.make_key([{"name": "Thabo"}], ["form.html"], {}) != key
@@ -0,0 +1,61 @@
+import os
+import uuid
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+import pdf_jobs
+import render_pool
+import report_pdf
+
+
+def employee_rows():
+    # Two employees called Jan Botha, whose rows interleave once sorted by name and date
+    rows = [
+        ("Botha", "Jan", "1", "2025-05-01"), ("Botha", "Jan", "2", "2025-05-02"),
+        ("Botha", "Jan", "1", "2025-05-03"), ("Dlamini", "Sipho", "3", "2025-05-01"),
+        ("Dlamini", "Sipho", "3", "2025-05-04"), ("Smit", "Leah", "4", "2025-05-02"),
+    ]
+    df = pd.DataFrame(rows, columns=["Surname", "Name", "Employee ID", "Date"])
+    df["Date"] = pd.to_datetime(df["Date"])
+    df["Event Name"] = "Cleaning Shop"
+    df["Amount Payable"] = 100.0
+    return df.sort_values(report_pdf.REPORT_SORTS["employee"], kind="stable", ignore_index=True)
+
+
+def test_chunks_end_on_the_groups_the_template_lists(monkeypatch):
+    monkeypatch.setattr(report_pdf, "REPORT_CHUNK_ROWS", 2)
+    assert report_pdf.chunk_starts(employee_rows(), "reports/by_employee.html") == [0, 3, 5]
+
+
+def test_only_the_first_chunk_has_the_title(workdir, monkeypatch):
+    monkeypatch.setattr(report_pdf, "REPORT_CHUNK_ROWS", 2)
+    monkeypatch.setattr(render_pool, "PDF_WORKERS", 1)
+    rendered = []
+    # The HTML of every chunk is kept instead of being laid out by WeasyPrint
+    fake_html = SimpleNamespace(write_pdf=lambda: b"%PDF-")
+    monkeypatch.setattr(report_pdf, "weasyprint",
+                        SimpleNamespace(HTML=lambda string: rendered.append(string) or fake_html))
+    monkeypatch.setattr(report_pdf, "merge_pdfs", lambda parts, out: None)
+
+    report_pdf.render_report(employee_rows(), "reports/by_employee.html")
+
+    assert len(rendered) == 3
+    assert ["Report by Employee" in html for html in rendered] == [True, False, False]
+
+
+def test_export_job_renders_in_its_own_process(workdir, monkeypatch):
+    monkeypatch.setattr(report_pdf, "REPORT_CHUNK_ROWS", 2)
+    monkeypatch.setattr(render_pool, "PDF_WORKERS", 4)
+    # The job worker must not start a render pool of its own
+    monkeypatch.setattr(render_pool, "_get_pool", lambda: pytest.fail("render pool used by an export job"))
+    fake_html = SimpleNamespace(write_pdf=lambda: b"%PDF-")
+    monkeypatch.setattr(report_pdf, "weasyprint", SimpleNamespace(HTML=lambda string: fake_html))
+    monkeypatch.setattr(report_pdf, "merge_pdfs", lambda parts, out: [out.write(part.read()) for part in parts])
+
+    job_id = uuid.uuid4().hex
+    os.makedirs(pdf_jobs.job_dir(job_id))
+    pdf_jobs._run_job(job_id, "employee", "202505.csv")
+
+    assert pdf_jobs.read_status(job_id)["state"] == "done"
@@ -0,0 +1,37 @@
+import pandas as pd
+
+import render_pool
+import report_pdf
+from event_store import amount_cents
+from report_query import query_events, summarise
+
+
+def test_range_without_events_is_a_typed_empty_frame(workdir):
+    df = query_events(pd.Timestamp("2020-05-01"), pd.Timestamp("2020-06-30"))
+    assert df.empty
+    assert df["Amount Payable"].dtype == "float64"
+    assert amount_cents(df).sum() == 0
+    assert summarise(df)["total"] == 0.0
+
+
+def test_amount_cents_accepts_an_untyped_frame():
+    df = pd.DataFrame({"Amount Payable": pd.Series(["12.50", None, "x"], dtype=object)})
+    assert amount_cents(df).tolist() == [1250, 0, 0]
+
+
+def test_range_pdf_without_events(client, monkeypatch):
+    totals = []
+    # Only the totals are checked here, the PDF itself needs WeasyPrint
+    monkeypatch.setattr(render_pool, "PDF_WORKERS", 1)
+    monkeypatch.setattr(report_pdf, "_render_part",
+                        lambda df, template, period, total, *args: totals.append(total) or b"%PDF-")
+
+    response = client.get("/report/pdf/range?start=2020-05-01&end=2020-06-30")
+    assert response.status_code == 200
+    assert totals == [0.0]
+
+
+def test_range_query_without_events(client):
+    response = client.get("/report/query?start=2020-05-01&end=2020-06-30")
+    assert response.status_code == 200
+    assert response.get_json()["rows"] == []
@@ -0,0 +1,38 @@
+# The same requests against both storage backends (see the backend fixture in conftest.py).
+import json
+
+import pandas as pd
+
+
+def test_malformed_event_id(client):
+    response = client.get("/generate-event-pdfs/202505/nounderscore")
+    assert response.status_code == 404
+
+    response = client.get("/get-employees-in-event/202505/nounderscore")
+    assert response.status_code == 200
+    assert response.get_json() == {"employees": []}
+
+
+def test_update_employee_with_missing_fields(client, backend):
+    id_number = backend.employee_store.records()[0]["ID Number"]
+    response = client.post("/update_employee", data={"id_number": id_number, "surname": "Botha"})
+    assert response.status_code == 302
+
+    employee = backend.employee_store.get(id_number)
+    assert employee["Surname"] == "Botha"
+    assert employee["Name"] == ""
+
+
+def test_unpadded_date_is_found_by_month_and_range(client, backend):
+    id_number = backend.employee_store.records()[0]["ID Number"]
+    response = client.post("/events", data={
+        "eventName": "Cleaning Shop", "eventDate": "2025-5-3", "amountPayable": "120.50",
+        "assignedEmployees": json.dumps([id_number])})
+    assert response.status_code == 302
+
+    month = backend.load_month("202505")
+    assert ((month["Employee ID"] == id_number) & (month["Date"] == "2025-05-03")
+            & (month["Amount Payable"] == 120.5)).sum() == 1
+
+    in_range = backend.query_events(pd.Timestamp("2025-05-03"), pd.Timestamp("2025-05-03"))
+    assert (in_range["Amount Payable"] == 120.5).sum() == 1
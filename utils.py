@@ -1,40 +1,42 @@
 from datetime import datetime
-import os
-import pandas as pd
-from PyPDF2 import PdfMerger
-from config import EMPLOYEE_CSV, CSV_ENCODING, EVENT_FOLDER
+from lazy_imports import lazy_import
+from instrumentation import span
+from storage import employee_store, append_event_rows
+from safe_write import normalise_record
+from event_store import encode_event_id, decode_event_id
+
+PyPDF2 = lazy_import("PyPDF2")
 
 # ──────────────────────────────────────
 # 💾 Employee + Event CSV Operations
 # ──────────────────────────────────────
 
 # This module handles reading employee data from a CSV file and saving event rows to CSV files.
+# Employees come from the shared in-process store, so the CSV is only parsed when it changes.
 def read_employees():
-    df = pd.read_csv(EMPLOYEE_CSV, encoding=CSV_ENCODING, dtype={"ID Number": str, "Contact": str})
-    return df.to_dict(orient="records")
+    return employee_store.records()
 
 # This function saves event rows to a CSV file named by the event date.
 # The date is formatted as YYYYMM, and if the file already exists, it appends
+# only the new rows instead of reading and rewriting the whole month.
 def save_event_rows(rows, event_date):
     try:
-        timestamp = datetime.strptime(event_date, "%Y-%m-%d").strftime("%Y%m")
+        parsed = datetime.strptime(event_date.strip(), "%Y-%m-%d")
     except ValueError:
         print("Invalid event date format.")
         return
-    # Ensure the event folder exists
-    filename = os.path.join(EVENT_FOLDER, f"{timestamp}.csv")
-    df_new = pd.DataFrame(rows)
+    if not rows:
+        return
+    timestamp = parsed.strftime("%Y%m")
 
-    # Create the event folder if it doesn't exist
-    if not os.path.exists(filename):
-        df_new.to_csv(filename, index=False, encoding=CSV_ENCODING)
-    else:
-        try:
-            existing = pd.read_csv(filename, encoding=CSV_ENCODING)
-            df = pd.concat([existing, df_new], ignore_index=True)
-        except pd.errors.EmptyDataError:
-            df = df_new
-        df.to_csv(filename, index=False, encoding=CSV_ENCODING)
+    # Values are stripped once here, so reads never have to clean them.
+    # strptime also accepts "2025-5-3", so the date is written zero-padded: event IDs
+    # and the date ranges of the SQLite queries rely on it.
+    date = parsed.strftime("%Y-%m-%d")
+    rows = [dict(normalise_record(row), Date=date) for row in rows]
+
+    # Appended to the month's CSV file or to the SQLite database, see storage.py
+    append_event_rows(timestamp, rows)
 
 # ──────────────────────────────────────
 # 📎 PDF Utilities
@@ -42,10 +44,11 @@ def save_event_rows(rows, event_date):
 
 # This module provides utilities for merging PDF files and retrieving employer information.
 def merge_pdfs(pdf_paths, output_path):
-    merger = PdfMerger()
-    for path in pdf_paths:
-        merger.append(path)
-    merger.write(output_path)
+    with span("merge_pdfs"):
+        merger = PyPDF2.PdfMerger()
+        for path in pdf_paths:
+            merger.append(path)
+        merger.write(output_path)
     merger.close()
 
 # This function retrieves employer information, which can be used in PDF generation or other contexts.
@@ -61,13 +64,5 @@ def get_employer_info():
 # 🔖 Event ID Helpers
 # ──────────────────────────────────────
 
-# These functions encode and decode event IDs based on the event date and name.
-# The event ID is a combination of the date and the event name, formatted for easy retrieval
-def encode_event_id(date_str, name):
-    return f"{date_str}_{name.replace(' ', '_')}"
-
-# This function decodes an event ID back into its date and name components.
-# It splits the ID at the first underscore to separate the date from the name.
-def decode_event_id(event_id):
-    date_part, name_part = event_id.split("_", 1)
-    return date_part, name_part.replace("_", " ")
\ No newline at end of file
+# encode_event_id and decode_event_id live in event_store.py, because the monthly
+# event index is keyed by them. They are imported above so existing callers keep working.